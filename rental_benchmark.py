@@ -0,0 +1,201 @@
+"""
+Benchmarks for the Rental class, summary export, the scripted calculator, and memory per property.
+Run with: python rental_benchmark.py --output results.json [--compare old_results.json]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+
+from rental_compact import CompactRental
+from rental_property_program import CentsRental, Rental, run_headless
+
+# Answers for one full scripted session of rental_property_calculator
+SCRIPT = (
+    ["2000","50","0","n"]
+    + ["100"] * 9 + ["n","n"]
+    + ["40000","3000","7000","n","n","n"]
+    + ["n"]
+)
+
+def make_rental(line_items:int):
+    """
+    Function to make a Rental with about line_items line items, split across income, expenses, and investments
+    """
+    rental = Rental()
+    for i in range(max(line_items // 3,1)):
+        rental.update_income_source(f"income {i}",1000 + i * .01)
+        rental.update_expense(f"expense {i}",100 + i * .01)
+        rental.update_investment(f"investment {i}",10000 + i * .01)
+    return rental
+
+def time_call(function):
+    """
+    Function to time a call with timeit, running it enough times to take at least 0.2 seconds.
+    Returns the best seconds per call out of three runs.
+    """
+    timer = timeit.Timer(function)
+    number,_ = timer.autorange()
+    return min(timer.repeat(repeat=3,number=number)) / number
+
+def bench_getters(sizes):
+    """
+    Function to time the Rental getters at each number of line items
+    """
+    results = []
+    for size in sizes:
+        rental = make_rental(size)
+        for name in ("get_monthly_income","get_monthly_expenses","get_total_investment","get_yearly_cashflow","get_yearly_return_on_investment"):
+            method = getattr(rental,name)
+            results.append({"name":name,"line_items":size,"seconds_per_call":time_call(method)})
+    return results
+
+def bench_show(sizes):
+    """
+    Function to time show_income_sources, show_expenses, and show_investments at each number of line items
+    """
+    results = []
+    for size in sizes:
+        rental = make_rental(size)
+        for name in ("show_income_sources","show_expenses","show_investments"):
+            method = getattr(rental,name)
+            def show():
+                with contextlib.redirect_stdout(io.StringIO()):
+                    method()
+            results.append({"name":name,"line_items":size,"seconds_per_call":time_call(show)})
+    return results
+
+def bench_export(files:int,line_items:int=30):
+    """
+    Function to time writing files summaries with export_summary, in a temporary directory
+    """
+    rental = make_rental(line_items)
+    with tempfile.TemporaryDirectory() as directory:
+        cwd = os.getcwd()
+        os.chdir(directory)
+        try:
+            start = time.perf_counter()
+            for i in range(files):
+                rental.export_summary(f"Property {i}")
+            seconds = time.perf_counter() - start
+        finally:
+            os.chdir(cwd)
+    return [{"name":"export_summary","line_items":line_items,"files":files,"seconds":seconds,"files_per_second":files / seconds}]
+
+def bench_session():
+    """
+    Function to time a full scripted session of rental_property_calculator, without typing effects or delays
+    """
+    seconds = time_call(lambda: run_headless(SCRIPT))
+    return [{"name":"rental_property_calculator (scripted)","seconds_per_call":seconds}]
+
+def bench_memory(properties:int=10_000):
+    """
+    Function to measure the memory used per property by Rental, CentsRental, and CompactRental,
+    each with the line items the interactive calculator asks for
+    """
+    line_items = (
+        [("income",source) for source in ("rent","laundry","storage")]
+        + [("expense",source) for source in ("taxes","insurance","utlities","hoa fees","vacancy","repairs","capex","property management","mortgage")]
+        + [("investment",source) for source in ("down payment","closing cost","rehab cost")]
+    )
+    results = []
+    for cls in (Rental,CentsRental,CompactRental):
+        tracemalloc.start()
+        rentals = [cls() for _ in range(properties)]
+        for i,rental in enumerate(rentals):
+            for source_type,source in line_items:
+                rental.set_source(source_type,source,100 + i % 1000 + .25)
+        used = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del rentals
+        results.append({"name":f"memory {cls.__name__}","line_items":len(line_items),"bytes_per_property":used / properties})
+    return results
+
+def run(sizes=(10,1_000,100_000),export_files:int=1_000):
+    """
+    Function to run every benchmark. Returns a dict ready to be written as JSON.
+    """
+    return {
+        "python":platform.python_version(),
+        "platform":platform.platform(),
+        "time":time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results":bench_getters(sizes) + bench_show(sizes) + bench_export(export_files) + bench_session() + bench_memory(),
+    }
+
+def _result_key(result:dict):
+    """
+    Function to get what identifies a result between runs. Export results are only compared with runs
+    that wrote the same number of files.
+    """
+    return (result["name"],result.get("line_items"),result.get("files"))
+
+# What each kind of result is measured by, and whether a bigger number is better
+_METRICS = (("seconds_per_call",False),("files_per_second",True),("bytes_per_property",False))
+
+def _result_metric(result:dict):
+    """
+    Function to get the (metric name, value, bigger is better) a result is compared by
+    """
+    for metric,bigger_is_better in _METRICS:
+        if metric in result:
+            return metric, result[metric], bigger_is_better
+    raise ValueError(f"result {result['name']!r} has no metric to compare")
+
+def compare(baseline:dict,current:dict,tolerance:float):
+    """
+    Function to find results that got worse than the baseline by more than tolerance (0.2 is 20%): slower
+    calls, fewer files per second, or more bytes per property. Results without a match in the baseline are skipped.
+    Returns a list of (name, line items, metric name, baseline value, current value).
+    """
+    previous = {_result_key(result):_result_metric(result)[1] for result in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        old = previous.get(_result_key(result))
+        metric,new,bigger_is_better = _result_metric(result)
+        if not old:
+            continue
+        worse = new * (1 + tolerance) < old if bigger_is_better else new > old * (1 + tolerance)
+        if worse:
+            regressions.append((result["name"],result.get("line_items"),metric,old,new))
+    return regressions
+
+def main(argv=None):
+    """
+    Function to run the benchmarks from the command line
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the rental property program")
+    parser.add_argument("--output",help="file to write the JSON results to (default: print them)")
+    parser.add_argument("--compare",help="JSON results of an earlier run to check for regressions")
+    parser.add_argument("--tolerance",type=float,default=.2,help="allowed slowdown before a result counts as a regression")
+    parser.add_argument("--quick",action="store_true",help="use smaller sizes for a fast check")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        results = run(sizes=(10,1_000),export_files=100)
+    else:
+        results = run()
+    text = json.dumps(results,indent=2)
+    if args.output:
+        with open(args.output,"w") as file:
+            file.write(text)
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(json.load(file),results,args.tolerance)
+        for name,line_items,metric,old,new in regressions:
+            print(f"Regression: {name} ({line_items} line items) {metric} went from {old:.3g} to {new:.3g}",file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+from collections import OrderedDict
+
+class Evaluation():
+    """
+    Class to hold the computed totals, cashflow, and ROI of a Rental. roi and roi_text are None
+    when there is no investment, where Rental.get_yearly_return_on_investment would raise.
+    """
+    def __init__(self,rental) -> None:
+        self.monthly_income = rental.get_monthly_income()
+        self.monthly_expenses = rental.get_monthly_expenses()
+        self.total_investment = rental.get_total_investment()
+        self.monthly_cashflow = rental.get_monthly_cashflow()
+        self.yearly_cashflow = rental.get_yearly_cashflow()
+        if self.total_investment:
+            self.roi = rental.get_yearly_roi()
+            self.roi_text = rental.get_yearly_return_on_investment()
+        else:
+            self.roi = None
+            self.roi_text = None
+        # Rendered summary rows without the property name row, filled in the first time they are asked for
+        self.summary_rows = None
+
+class EvaluationCache():
+    """
+    Class to remember evaluations of Rentals by the content of their dicts, so identical properties
+    are only evaluated once. Entries are keyed by Rental.fingerprint(), which changes whenever an add,
+    update, or remove method changes the Rental, so a changed Rental is never served a stale result.
+    Holds at most maxsize evaluations and drops the least recently used one when full.
+    """
+    def __init__(self,maxsize:int=10_000) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._evaluations = OrderedDict()
+
+    def __len__(self):
+        return len(self._evaluations)
+
+    def evaluate(self,rental) -> Evaluation:
+        """
+        Method to get the Evaluation of a Rental, from the cache if an identical Rental was evaluated before
+        """
+        key = rental.fingerprint()
+        evaluation = self._evaluations.get(key)
+        if evaluation is not None:
+            self.hits += 1
+            self._evaluations.move_to_end(key)
+            return evaluation
+        self.misses += 1
+        evaluation = Evaluation(rental)
+        self._evaluations[key] = evaluation
+        if len(self._evaluations) > self.maxsize:
+            self._evaluations.popitem(last=False)
+        return evaluation
+
+    def summary_rows(self,rental,property_name:str):
+        """
+        Method to get the rows export_summary would write for a Rental, rendering them only once per identical Rental
+        """
+        evaluation = self.evaluate(rental)
+        if evaluation.summary_rows is None:
+            evaluation.summary_rows = rental.summary_rows(property_name)[1:]
+        return [["Rental Property Name",property_name]] + evaluation.summary_rows
+
+    def clear(self):
+        """
+        Method to empty the cache and reset the hit and miss counters
+        """
+        self._evaluations.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        """
+        Method to get the hits, misses, current size, and maximum size of the cache as a dict
+        """
+        return {"hits":self.hits,"misses":self.misses,"size":len(self._evaluations),"maxsize":self.maxsize}
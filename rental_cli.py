@@ -0,0 +1,189 @@
+"""
+Command line entry point for evaluating many properties at once.
+Inputs are ledger files (CSV or JSONL rows of property, kind, source, amount), export_summary files
+(names ending in _ValueEstimate.csv), or directories of export_summary files. Results are written to
+stdout as JSON lines, one object per property, so they can be piped into other tools.
+
+    python rental_cli.py evaluate ledger.csv
+    python rental_cli.py rank summaries/ --by yearly_cashflow --top 10
+    python rental_cli.py export ledger.jsonl --directory out --layout single
+    python rental_cli.py calculator
+"""
+import argparse
+import json
+import os
+import sys
+
+# Only the standard library and the modules every subcommand needs are imported up front. NumPy,
+# process pools, and the exporters are imported by the subcommands that use them.
+from rental_import import LedgerLoader, load_summaries, source_types
+
+def _merge(loader:LedgerLoader,scratch:LedgerLoader):
+    """
+    Function to add everything a scratch LedgerLoader read to loader
+    """
+    for property_id,rental in scratch.rentals.items():
+        for kind,source_dict in zip(source_types,(rental.income_dict,rental.expense_dict,rental.investment_dict)):
+            for source,amount in source_dict.items():
+                loader.add_row(property_id,kind,source,amount)
+    loader.duplicates += scratch.duplicates
+    loader.duplicates_by_property.update(scratch.duplicates_by_property)
+    loader.errors.update(scratch.errors)
+
+def _load(inputs:list,workers:int=None):
+    """
+    Function to load every input into one LedgerLoader. Each input is read into its own loader first
+    and only added once it has been read completely, so an input that can't be parsed is skipped
+    as a whole and reported on stderr. In a directory, only the files that can't be parsed are skipped.
+    """
+    loader = LedgerLoader()
+    for name in inputs:
+        try:
+            if os.path.isdir(name):
+                scratch = load_summaries(name,workers=workers)
+            elif name.endswith("_ValueEstimate.csv"):
+                scratch = LedgerLoader().load_summary(name)
+            else:
+                scratch = LedgerLoader().load_file(name)
+        except (OSError,ValueError) as error:
+            loader.errors[name] = str(error)
+        else:
+            _merge(loader,scratch)
+    for name,error in loader.errors.items():
+        print(f"Skipped {name}: {error}",file=sys.stderr)
+    return loader
+
+def _record(property_id,rental):
+    """
+    Function to get the JSON object written for a property. roi is None when there is no investment.
+    """
+    total_investment = rental.get_total_investment()
+    return {
+        "property":property_id,
+        "monthly_income":rental.get_monthly_income(),
+        "monthly_expenses":rental.get_monthly_expenses(),
+        "monthly_cashflow":rental.get_monthly_cashflow(),
+        "yearly_cashflow":rental.get_yearly_cashflow(),
+        "total_investment":total_investment,
+        "roi":rental.get_yearly_roi() if total_investment else None,
+    }
+
+def _write_records(records):
+    write = sys.stdout.write
+    dumps = json.dumps
+    for record in records:
+        write(dumps(record))
+        write("\n")
+
+def evaluate(args):
+    """
+    Function to write the totals, cashflow, and ROI of every property
+    """
+    loader = _load(args.inputs,args.workers)
+    _write_records(_record(property_id,rental) for property_id,rental in loader.rentals.items())
+    return 1 if loader.errors and args.strict else 0
+
+def rank(args):
+    """
+    Function to write the properties with the best (or worst) values, best first
+    """
+    loader = _load(args.inputs,args.workers)
+    from rental_query import PortfolioQuery
+    query = PortfolioQuery(loader.rentals)
+    row_sets = [query.between(args.by,args.min,args.max)]
+    if args.with_expense:
+        row_sets.append(query.with_expense(args.with_expense))
+    if args.without_expense:
+        row_sets.append(query.without_expense(args.without_expense))
+    rows = query.narrow(*row_sets)
+    top = len(rows) if args.top is None else args.top
+    rows = query.top(top,by=args.by,rows=rows,largest=not args.smallest)
+    _write_records(_record(property_id,loader.rentals[property_id]) for property_id in query.ids(rows))
+    return 1 if loader.errors and args.strict else 0
+
+def export(args):
+    """
+    Function to export the summary of every property and write one line saying how many were written.
+    Properties with no investment are left out and reported on stderr.
+    """
+    loader = _load(args.inputs,args.workers)
+    from rental_export import export_summaries
+    os.makedirs(args.directory,exist_ok=True)
+    # A summary has an ROI row, which can't be worked out without an investment
+    properties = []
+    skipped = []
+    for property_id,rental in loader.rentals.items():
+        if rental.get_total_investment():
+            properties.append((str(property_id),rental))
+        else:
+            skipped.append(property_id)
+    for property_id in skipped:
+        print(f"Skipped property {property_id}: no investment, so it has no ROI",file=sys.stderr)
+    count = export_summaries(properties,args.directory,layout=args.layout,workers=args.workers)
+    _write_records([{"written":count,"directory":args.directory,"layout":args.layout}])
+    return 1 if (loader.errors or skipped) and args.strict else 0
+
+def calculator(args):
+    """
+    Function to run the interactive calculator, or replay a script of answers with --script
+    """
+    from rental_property_program import rental_property_calculator, run_headless
+    if args.script:
+        _,report = run_headless(args.script)
+        sys.stdout.write(report)
+    else:
+        rental_property_calculator()
+    return 0
+
+def make_parser():
+    """
+    Function to build the argument parser
+    """
+    parser = argparse.ArgumentParser(description="Evaluate rental properties in bulk")
+    subparsers = parser.add_subparsers(dest="command",required=True)
+
+    def add_input_arguments(subparser):
+        subparser.add_argument("inputs",nargs="+",help="ledger files, export_summary files, or directories of export_summary files")
+        subparser.add_argument("--workers",type=int,help="processes to parse summary directories (and export) with")
+        subparser.add_argument("--strict",action="store_true",help="exit with status 1 if any input was skipped")
+
+    subparser = subparsers.add_parser("evaluate",help="write totals, cashflow, and ROI of every property")
+    add_input_arguments(subparser)
+    subparser.set_defaults(function=evaluate)
+
+    subparser = subparsers.add_parser("rank",help="write the best properties by a value, best first")
+    add_input_arguments(subparser)
+    subparser.add_argument("--by",default="roi",choices=("roi","yearly_cashflow","monthly_cashflow","total_investment"))
+    subparser.add_argument("--top",type=int,help="number of properties to write (default: all)")
+    subparser.add_argument("--smallest",action="store_true",help="rank the smallest values first")
+    subparser.add_argument("--min",type=float,help="leave out properties with a lower value")
+    subparser.add_argument("--max",type=float,help="leave out properties with a higher value")
+    subparser.add_argument("--with-expense",help="only properties that have this expense")
+    subparser.add_argument("--without-expense",help="only properties that don't have this expense")
+    subparser.set_defaults(function=rank)
+
+    subparser = subparsers.add_parser("export",help="write the export_summary CSV of every property")
+    add_input_arguments(subparser)
+    subparser.add_argument("--directory",default=".",help="directory to write to (default: current directory)")
+    subparser.add_argument("--layout",default="files",choices=("files","single"),help="one file per property, or one file")
+    subparser.set_defaults(function=export)
+
+    subparser = subparsers.add_parser("calculator",help="run the interactive rental property calculator")
+    subparser.add_argument("--script",help="file of answers to replay without typing effects")
+    subparser.set_defaults(function=calculator)
+    return parser
+
+def main(argv=None):
+    """
+    Function to run the command line
+    """
+    args = make_parser().parse_args(argv)
+    try:
+        return args.function(args)
+    except BrokenPipeError:
+        # The reader went away, like head in a pipeline. Point stdout at devnull so the exit flush doesn't fail again.
+        os.dup2(os.open(os.devnull,os.O_WRONLY),sys.stdout.fileno())
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+from array import array
+import sys
+from types import MappingProxyType
+
+from rental_property_program import Rental
+
+class SourceNameTable():
+    """
+    Class to give every source name a small integer id, so a name like "rent" is stored once
+    no matter how many properties have it
+    """
+    def __init__(self) -> None:
+        self.names = []
+        self._ids = dict()
+
+    def __len__(self):
+        return len(self.names)
+
+    def get_id(self,name:str):
+        """
+        Method to get the id of a name, or None if it isn't in the table
+        """
+        return self._ids.get(name)
+
+    def intern(self,name:str):
+        """
+        Method to get the id of a name, adding it to the table if needed
+        """
+        source_id = self._ids.get(name)
+        if source_id is None:
+            name = sys.intern(name)
+            source_id = len(self.names)
+            self._ids[name] = source_id
+            self.names.append(name)
+        return source_id
+
+# Table shared by every CompactRental
+source_names = SourceNameTable()
+
+_type_codes = {"income":0,"expense":1,"investment":2}
+
+class CompactRental():
+    """
+    Class with the same public API as Rental, built to keep hundreds of thousands of properties in memory.
+    It has no __dict__: each property is two arrays, one of line item keys (an id from the shared
+    source_names table and the source type) and one of amounts in whole cents, plus exact cent totals.
+    Amounts are rounded to the nearest cent like CentsRental. income_dict, expense_dict, and investment_dict
+    are read-only mappings built on request; change amounts with the add, update, and remove methods.
+    Finding a source scans the key array, which is fast for the dozens of line items a property usually has.
+    """
+    __slots__ = ("_keys","_cents","_total_cents","_loans","_fingerprint")
+
+    def __init__(self) -> None:
+        # Key of a line item is source id * 3 + type code, in the order line items were added
+        self._keys = array("I")
+        self._cents = array("q")
+        self._total_cents = array("q",(0,0,0))
+        self._loans = None
+        self._fingerprint = None
+
+    def __getstate__(self):
+        # Source ids only mean something in this process, so pickle the names instead
+        return [(key % 3,source_names.names[key // 3],cents) for key,cents in zip(self._keys,self._cents)], self._loans
+
+    def __setstate__(self,state):
+        self.__init__()
+        line_items,self._loans = state
+        for type_code,source,cents in line_items:
+            self._keys.append(source_names.intern(source) * 3 + type_code)
+            self._cents.append(cents)
+            self._total_cents[type_code] += cents
+
+    def _view(self,type_code:int):
+        """
+        Method to get a read-only mapping of source name to dollar amount for a type code
+        """
+        names = source_names.names
+        return MappingProxyType({names[key // 3]:cents / 100 for key,cents in zip(self._keys,self._cents) if key % 3 == type_code})
+
+    income_dict = property(lambda self: self._view(0))
+    expense_dict = property(lambda self: self._view(1))
+    investment_dict = property(lambda self: self._view(2))
+
+    @property
+    def loan_dict(self):
+        # Most properties never have a loan, so the dict is only made when it is first needed
+        if self._loans is None:
+            self._loans = dict()
+        return self._loans
+
+    def _set_amount(self,source_type:str,source:str,amount:float):
+        """
+        Method to set the amount of a source, rounded to the nearest cent.
+        Returns the previous amount, or None if the source is new.
+        """
+        type_code = _type_codes[source_type]
+        key = source_names.intern(source) * 3 + type_code
+        cents = round(amount * 100)
+        self._fingerprint = None
+        try:
+            position = self._keys.index(key)
+        except ValueError:
+            self._keys.append(key)
+            self._cents.append(cents)
+            self._total_cents[type_code] += cents
+            return None
+        previous = self._cents[position]
+        self._cents[position] = cents
+        self._total_cents[type_code] += cents - previous
+        return previous / 100
+
+    def _remove_amount(self,source_type:str,source:str):
+        """
+        Method to remove a source
+        """
+        type_code = _type_codes[source_type]
+        source_id = source_names.get_id(source)
+        if source_id is None:
+            raise KeyError(source)
+        try:
+            position = self._keys.index(source_id * 3 + type_code)
+        except ValueError:
+            raise KeyError(source) from None
+        del self._keys[position]
+        self._total_cents[type_code] -= self._cents.pop(position)
+        self._fingerprint = None
+
+    def get_total_cents(self,source_type:str):
+        """
+        Method to get the exact total of 'income', 'expense', or 'investment' as a whole number of cents
+        """
+        return self._total_cents[_type_codes[source_type]]
+
+    def get_monthly_income(self):
+        """
+        Method to get monthly income
+        """
+        return self._total_cents[0] / 100
+
+    def get_monthly_expenses(self):
+        """
+        Method to get monthly expenses
+        """
+        return self._total_cents[1] / 100
+
+    def get_total_investment(self):
+        """
+        Method to get total investments
+        """
+        return self._total_cents[2] / 100
+
+    # The rest of the API only goes through the dicts, the getters above, and _set_amount and
+    # _remove_amount, so it is shared with Rental as is
+    _source_dict = Rental._source_dict
+    set_source = Rental.set_source
+    fingerprint = Rental.fingerprint
+    add_income_source = Rental.add_income_source
+    add_expense = Rental.add_expense
+    add_investment = Rental.add_investment
+    update_income_source = Rental.update_income_source
+    update_expense = Rental.update_expense
+    update_investment = Rental.update_investment
+    add_loan = Rental.add_loan
+    remove_loan = Rental.remove_loan
+    remove_income_source = Rental.remove_income_source
+    remove_expense = Rental.remove_expense
+    remove_investment = Rental.remove_investment
+    get_yearly_income = Rental.get_yearly_income
+    get_yearly_expenses = Rental.get_yearly_expenses
+    _render_table = Rental._render_table
+    show_income_sources = Rental.show_income_sources
+    show_expenses = Rental.show_expenses
+    show_investments = Rental.show_investments
+    show_sources = Rental.show_sources
+    get_monthly_cashflow = Rental.get_monthly_cashflow
+    get_yearly_cashflow = Rental.get_yearly_cashflow
+    get_yearly_roi = Rental.get_yearly_roi
+    get_yearly_return_on_investment = Rental.get_yearly_return_on_investment
+    sweep = Rental.sweep
+    summary_rows = Rental.summary_rows
+    export_summary = Rental.export_summary
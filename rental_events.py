@@ -0,0 +1,121 @@
+from bisect import bisect_right
+
+from rental_property_program import Rental
+
+source_types = ("income","expense","investment")
+
+class RoiCrossing():
+    """
+    Class to hold a notification that a property's ROI moved past a threshold.
+    direction is 'up' if the ROI rose past the threshold and 'down' if it fell below it.
+    """
+    def __init__(self,property_id,threshold:float,previous_roi:float,roi:float) -> None:
+        self.property_id = property_id
+        self.threshold = threshold
+        self.previous_roi = previous_roi
+        self.roi = roi
+        self.direction = "up" if roi > previous_roi else "down"
+
+    def __repr__(self) -> str:
+        return f"RoiCrossing({self.property_id!r}, {self.threshold}, {self.previous_roi} -> {self.roi})"
+
+class EventFeed():
+    """
+    Class to apply a stream of line item events to many Rentals and watch their ROI.
+    An event is a (property, action, kind, source, amount) tuple, where action is 'add', 'update', or
+    'remove' and kind is 'income', 'expense', or 'investment'. amount is ignored for 'remove'.
+    'add' and 'update' both set the amount, without printing a warning, and an unknown property is
+    created on its first 'add' or 'update'. Removing a source that isn't there is counted in missing.
+    Rentals keep running totals, so each event updates cashflow and ROI in constant time. The ROI of each
+    property is kept in roi (None while it has no investment) and a RoiCrossing is produced whenever an
+    event moves it past one of the thresholds (percentages, like 8 for 8%).
+    """
+    def __init__(self,rentals:dict=None,thresholds=(),rental_class=Rental) -> None:
+        self.rentals = rentals if rentals is not None else dict()
+        self.thresholds = sorted(thresholds)
+        self.rental_class = rental_class
+        self.events = 0
+        self.missing = 0
+        self.roi = {property_id:self._roi(rental) for property_id,rental in self.rentals.items()}
+
+    @staticmethod
+    def _roi(rental):
+        """
+        Method to get the ROI of a Rental, or None if it has no investment
+        """
+        if not rental.get_total_investment():
+            return None
+        return rental.get_yearly_roi()
+
+    def apply(self,property_id,action:str,kind:str,source:str,amount=None):
+        """
+        Method to apply a single event. Returns a list of RoiCrossings, empty if no threshold was crossed.
+        """
+        if kind not in source_types:
+            raise ValueError(f"Event kind must be 'income', 'expense', or 'investment', not {kind!r}")
+        rental = self.rentals.get(property_id)
+        if action == "remove":
+            removed = False
+            if rental is not None:
+                # remove_expense also drops a loan on the expense
+                remove = (rental.remove_income_source,rental.remove_expense,rental.remove_investment)[source_types.index(kind)]
+                try:
+                    remove(source)
+                    removed = True
+                except KeyError:
+                    pass
+            if not removed:
+                self.missing += 1
+                self.events += 1
+                return []
+        elif action == "add" or action == "update":
+            if rental is None:
+                rental = self.rentals[property_id] = self.rental_class()
+            rental.set_source(kind,source,amount)
+        else:
+            raise ValueError(f"Event action must be 'add', 'update', or 'remove', not {action!r}")
+        self.events += 1
+
+        previous = self.roi.get(property_id)
+        roi = self.roi[property_id] = self._roi(rental)
+        if previous is None or roi is None or not self.thresholds:
+            return []
+        # Thresholds split ROI into bands, so a crossing is any change of band
+        previous_band = bisect_right(self.thresholds,previous)
+        band = bisect_right(self.thresholds,roi)
+        if band == previous_band:
+            return []
+        crossed = self.thresholds[previous_band:band] if band > previous_band else reversed(self.thresholds[band:previous_band])
+        return [RoiCrossing(property_id,threshold,previous,roi) for threshold in crossed]
+
+    def process(self,events):
+        """
+        Method to apply every event from an iterable, like a generator reading a feed.
+        Yields RoiCrossings as they happen.
+        """
+        apply = self.apply
+        for event in events:
+            crossings = apply(*event)
+            if crossings:
+                yield from crossings
+
+    async def aprocess(self,events):
+        """
+        Method to apply every event from an async iterable. Yields RoiCrossings as they happen.
+        """
+        apply = self.apply
+        async for event in events:
+            for crossing in apply(*event):
+                yield crossing
+
+    def get_monthly_cashflow(self,property_id):
+        """
+        Method to get the current monthly cashflow of a property
+        """
+        return self.rentals[property_id].get_monthly_cashflow()
+
+    def get_yearly_cashflow(self,property_id):
+        """
+        Method to get the current yearly cashflow of a property
+        """
+        return self.rentals[property_id].get_yearly_cashflow()
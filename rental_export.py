@@ -0,0 +1,69 @@
+from concurrent.futures import ProcessPoolExecutor
+import csv
+import io
+import os
+
+from rental_property_program import summary_file_name
+
+def render_summaries(properties):
+    """
+    Function to render the summaries of (property name, Rental) pairs into one block of CSV text.
+    Each summary has exactly the rows export_summary writes, followed by two blank rows.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for property_name,rental in properties:
+        writer.writerows(rental.summary_rows(property_name))
+        writer.writerows(([''],['']))
+    return buffer.getvalue()
+
+def _write_summary_files(properties,directory:str,buffer_size:int):
+    """
+    Function to write one summary file per (property name, Rental) pair. Returns the number of files written.
+    """
+    count = 0
+    for property_name,rental in properties:
+        # Rows are built before the file is opened, so a Rental that can't be summarized leaves no empty file behind
+        rows = rental.summary_rows(property_name)
+        with open(os.path.join(directory,summary_file_name(property_name)),"w",buffering=buffer_size) as file:
+            csv.writer(file).writerows(rows)
+        count += 1
+    return count
+
+def _chunks(items:list,chunk_size:int):
+    return [items[i:i + chunk_size] for i in range(0,len(items),chunk_size)]
+
+def export_summaries(rentals,directory:str=".",layout:str="files",file_name:str="Portfolio_ValueEstimate.csv",
+                     workers:int=None,buffer_size:int=1 << 20,chunk_size:int=1000):
+    """
+    Function to export the summaries of many properties in one pass. Rentals is a dict of property name
+    to Rental, or an iterable of (property name, Rental) pairs.
+    layout 'files' writes one file per property, named like export_summary does, through a large buffer.
+    layout 'single' writes every summary, one after another, into a single file called file_name.
+    Set workers to spread the work over a pool of that many processes.
+    Returns the number of summaries written.
+    """
+    if layout not in ("files","single"):
+        raise ValueError(f"layout must be 'files' or 'single', not {layout!r}")
+    if isinstance(rentals,dict):
+        rentals = rentals.items()
+    properties = list(rentals)
+    chunks = _chunks(properties,chunk_size)
+
+    if layout == "files":
+        if not workers:
+            return _write_summary_files(properties,directory,buffer_size)
+        with ProcessPoolExecutor(workers) as pool:
+            counts = pool.map(_write_summary_files,chunks,[directory] * len(chunks),[buffer_size] * len(chunks))
+            return sum(counts)
+
+    with open(os.path.join(directory,file_name),"w",buffering=buffer_size) as file:
+        if not workers:
+            for chunk in chunks:
+                file.write(render_summaries(chunk))
+        else:
+            with ProcessPoolExecutor(workers) as pool:
+                # map keeps the chunks in order, so the file lists properties in the order given
+                for text in pool.map(render_summaries,chunks):
+                    file.write(text)
+    return len(properties)
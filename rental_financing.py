@@ -0,0 +1,130 @@
+import numpy as np
+
+def monthly_payment(principal,annual_rate,years):
+    """
+    Function to get the monthly payment of a fully amortizing loan. Works on numbers or NumPy arrays.
+    """
+    principal = np.asarray(principal,dtype=float)
+    monthly_rate = np.asarray(annual_rate,dtype=float) / 12
+    months = np.asarray(years) * 12
+    with np.errstate(divide="ignore",invalid="ignore"):
+        payment = principal * monthly_rate / (1 - (1 + monthly_rate) ** -months)
+    # A zero rate loan is just the principal split evenly over the term
+    return np.where(monthly_rate == 0,principal / months,payment)
+
+def remaining_balance(principal,annual_rate,years,months_paid):
+    """
+    Function to get the balance left on a fully amortizing loan after a number of monthly payments.
+    Works on numbers or NumPy arrays.
+    """
+    principal = np.asarray(principal,dtype=float)
+    monthly_rate = np.asarray(annual_rate,dtype=float) / 12
+    months_paid = np.minimum(months_paid,np.asarray(years) * 12)
+    payment = monthly_payment(principal,annual_rate,years)
+    growth = (1 + monthly_rate) ** months_paid
+    with np.errstate(divide="ignore",invalid="ignore"):
+        balance = principal * growth - payment * (growth - 1) / monthly_rate
+    balance = np.where(monthly_rate == 0,principal - payment * months_paid,balance)
+    # Clear the rounding left over once the loan is paid off
+    return np.maximum(balance,0.)
+
+class Schedule():
+    """
+    Class to hold amortization schedules. Each array has one row per loan and one column per month.
+    Months after a loan is paid off are zero.
+    """
+    def __init__(self,months,payment,interest,principal,balance) -> None:
+        self.months = months
+        self.payment = payment
+        self.interest = interest
+        self.principal = principal
+        self.balance = balance
+
+def _schedule(principal,annual_rate,years,months):
+    """
+    Function to work out the schedule of one or more loans for the given month numbers (1 is the first payment)
+    """
+    principal = np.atleast_1d(np.asarray(principal,dtype=float))[:,None]
+    annual_rate = np.atleast_1d(np.asarray(annual_rate,dtype=float))[:,None]
+    years = np.atleast_1d(np.asarray(years))[:,None]
+    months = np.asarray(months)
+    # Every month follows from the balances before and after it, so no month depends on a loop over earlier months
+    before = remaining_balance(principal,annual_rate,years,months - 1)
+    after = remaining_balance(principal,annual_rate,years,months)
+    active = months <= years * 12
+    interest = np.where(active,before * annual_rate / 12,0.)
+    paid_down = before - after
+    return Schedule(months,interest + paid_down,interest,paid_down,after)
+
+def amortization_schedule(principal,annual_rate,years):
+    """
+    Function to get the full amortization schedule of one loan, or of many loans at once when given arrays.
+    Every loan's schedule is as long as the longest term. Returns a Schedule.
+    """
+    longest = int(np.max(years)) * 12
+    return _schedule(principal,annual_rate,years,np.arange(1,longest + 1))
+
+def iter_schedule(principal:float,annual_rate:float,years:int,chunk_months:int=360):
+    """
+    Function to stream the schedule of a single loan as (month, payment, interest, principal, balance) tuples.
+    Only chunk_months months are worked out at a time, so very long schedules don't need to fit in memory.
+    """
+    total_months = int(years * 12)
+    for start in range(1,total_months + 1,chunk_months):
+        months = np.arange(start,min(start + chunk_months,total_months + 1))
+        schedule = _schedule(principal,annual_rate,years,months)
+        yield from zip(months.tolist(),schedule.payment[0].tolist(),schedule.interest[0].tolist(),
+                       schedule.principal[0].tolist(),schedule.balance[0].tolist())
+
+class Loan():
+    """
+    Class to describe a fully amortizing loan, like a mortgage. principal can be a number or an array
+    with one value per property, and annual_rate can be a number or an array of scenarios.
+    """
+    def __init__(self,principal,annual_rate,years:int=30) -> None:
+        self.principal = principal
+        self.annual_rate = annual_rate
+        self.years = years
+
+    def monthly_payment(self):
+        """
+        Method to get the monthly payment
+        """
+        return monthly_payment(self.principal,self.annual_rate,self.years)
+
+    def remaining_balance(self,months_paid):
+        """
+        Method to get the balance left after a number of monthly payments
+        """
+        return remaining_balance(self.principal,self.annual_rate,self.years,months_paid)
+
+    def schedule(self):
+        """
+        Method to get the full amortization schedule as a Schedule
+        """
+        return amortization_schedule(self.principal,self.annual_rate,self.years)
+
+    def iter_schedule(self,chunk_months:int=360):
+        """
+        Method to stream the amortization schedule one month at a time
+        """
+        return iter_schedule(self.principal,self.annual_rate,self.years,chunk_months)
+
+def schedule_loans(loans):
+    """
+    Function to get the amortization schedules of many Loans in one go. Returns a Schedule with one row per loan.
+    """
+    loans = list(loans)
+    return amortization_schedule(
+        [loan.principal for loan in loans],
+        [loan.annual_rate for loan in loans],
+        [loan.years for loan in loans],
+    )
+
+def rental_schedules(rental):
+    """
+    Function to get the amortization schedules of every loan attached to a Rental with add_loan.
+    Returns the source names and a Schedule with one row per loan, in the same order.
+    """
+    sources = list(rental.loan_dict)
+    return sources, schedule_loans(rental.loan_dict[source] for source in sources)
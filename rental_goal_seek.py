@@ -0,0 +1,91 @@
+import numpy as np
+
+from rental_financing import monthly_payment
+from rental_portfolio import as_portfolio
+
+# Cash on cash ROI is yearly cashflow * 100 / total investment, and yearly cashflow is
+# (monthly income - monthly expenses) * 12. Every line item shows up linearly in that formula,
+# so the amount of a single line item that hits a target ROI can be solved for directly.
+# goal_seek is for models that don't reduce to that formula.
+
+def max_investment(rentals,target_roi:float,source:str="down payment"):
+    """
+    Function to get, for every property, the largest amount of an investment source that still reaches
+    target_roi (a percentage, like 8 for 8%). Other line items stay as they are.
+    rentals can be a Rental, a dict of Rentals, or a RentalPortfolio. Returns an array with one answer per
+    property, nan where the target can't be reached (cashflow too low, or a non-positive target).
+    """
+    portfolio = as_portfolio(rentals)
+    other_investment = portfolio.get_total_investment() - portfolio.get_line_amounts("investment",source)
+    with np.errstate(divide="ignore",invalid="ignore"):
+        amount = portfolio.get_yearly_cashflow() * 100 / target_roi - other_investment
+    return np.where(amount >= 0,amount,np.nan) if target_roi > 0 else np.full(len(portfolio),np.nan)
+
+def min_income(rentals,target_roi:float,source:str="rent"):
+    """
+    Function to get, for every property, the smallest monthly amount of an income source that reaches
+    target_roi (a percentage). Returns an array with one answer per property. The answer is 0 where the
+    target is reached without that income at all.
+    """
+    portfolio = as_portfolio(rentals)
+    other_income = portfolio.get_monthly_income() - portfolio.get_line_amounts("income",source)
+    needed = target_roi * portfolio.get_total_investment() / 1200 + portfolio.get_monthly_expenses()
+    return np.maximum(needed - other_income,0.)
+
+def max_expense(rentals,target_roi:float,source:str):
+    """
+    Function to get, for every property, the largest monthly amount of an expense that still reaches
+    target_roi (a percentage). Returns an array with one answer per property, nan where the target can't be
+    reached even with no such expense.
+    """
+    portfolio = as_portfolio(rentals)
+    other_expenses = portfolio.get_monthly_expenses() - portfolio.get_line_amounts("expense",source)
+    amount = portfolio.get_monthly_income() - other_expenses - target_roi * portfolio.get_total_investment() / 1200
+    return np.where(amount >= 0,amount,np.nan)
+
+def max_purchase_price(rentals,target_roi:float,annual_rate:float,years:int=30,down_payment_ratio:float=.2,
+                       closing_cost_ratio:float=0.,down_payment_source:str="down payment",
+                       closing_cost_source:str="closing cost",loan_source:str="mortgage"):
+    """
+    Function to get, for every property, the highest purchase price that still reaches target_roi (a percentage)
+    when the price is financed: the down payment and closing cost are a share of the price, and the rest is a
+    loan whose payment is an expense. Any existing down payment, closing cost, and loan payment line items
+    are replaced by the ones for the price. Returns an array with one answer per property, nan where the
+    target can't be reached at any price.
+    """
+    portfolio = as_portfolio(rentals)
+    other_investment = (portfolio.get_total_investment() - portfolio.get_line_amounts("investment",down_payment_source)
+                        - portfolio.get_line_amounts("investment",closing_cost_source))
+    other_cashflow = portfolio.get_monthly_cashflow() + portfolio.get_line_amounts("expense",loan_source)
+    # Monthly loan payment per dollar of price
+    payment_rate = float(monthly_payment(1.,annual_rate,years)) * (1 - down_payment_ratio)
+    # Solving 1200 * (other cashflow - payment rate * price) = target * (price * (down + closing) + other investment)
+    with np.errstate(divide="ignore",invalid="ignore"):
+        price = (1200 * other_cashflow - target_roi * other_investment) / (1200 * payment_rate + target_roi * (down_payment_ratio + closing_cost_ratio))
+    return np.where(np.isfinite(price) & (price >= 0),price,np.nan)
+
+def goal_seek(roi_function,target_roi:float,low,high,tolerance:float=.005,max_iterations:int=100):
+    """
+    Function to find, for every property at once, the value that makes roi_function reach target_roi, by
+    bisection. roi_function takes an array of candidate values (one per property) and returns an array of ROIs.
+    It must move in one direction between low and high, which can be numbers or one per property.
+    Stops when every answer is within tolerance. Returns an array of answers, nan where the target is not
+    between the ROI at low and the ROI at high.
+    """
+    low,high = np.broadcast_arrays(np.asarray(low,dtype=float),np.asarray(high,dtype=float))
+    low,high = low.copy(),high.copy()
+    low_gap = roi_function(low) - target_roi
+    high_gap = roi_function(high) - target_roi
+    found = np.sign(low_gap) != np.sign(high_gap)
+    found |= (low_gap == 0) | (high_gap == 0)
+    # Whether ROI goes up as the value goes up, so bisection moves the right end
+    rising = high_gap > low_gap
+    for _ in range(max_iterations):
+        if np.all(high - low <= tolerance):
+            break
+        middle = (low + high) / 2
+        above = (roi_function(middle) - target_roi) > 0
+        move_high = above == rising
+        high = np.where(move_high,middle,high)
+        low = np.where(move_high,low,middle)
+    return np.where(found,(low + high) / 2,np.nan)
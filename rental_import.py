@@ -0,0 +1,254 @@
+from collections import Counter
+import csv
+import itertools
+import json
+import os
+
+from rental_property_program import Rental
+
+source_types = ("income","expense","investment")
+
+def iter_ledger_rows(file_name:str):
+    """
+    Function to stream (property, kind, source, amount) rows from a ledger file, one row at a time.
+    Files ending in .jsonl must have one object per line with property, kind, source, and amount keys.
+    Any other file is read as a CSV with those four columns. A header row is skipped if present.
+    Amounts are parsed here, so a bad amount is reported with its file and line like any other bad row.
+    """
+    with open(file_name,newline="") as file:
+        if file_name.endswith(".jsonl"):
+            for line_number,line in enumerate(file,1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    row = record["property"],record["kind"],record["source"],float(record["amount"])
+                except (ValueError,KeyError,TypeError) as error:
+                    raise ValueError(f"{file_name} line {line_number}: not a valid ledger row ({error})") from None
+                yield row
+        else:
+            for line_number,row in enumerate(csv.reader(file),1):
+                if not row:
+                    continue
+                if line_number == 1 and row[0].strip().lower() == "property":
+                    continue
+                if len(row) != 4:
+                    raise ValueError(f"{file_name} line {line_number}: expected 4 columns, found {len(row)}")
+                try:
+                    amount = float(row[3])
+                except ValueError:
+                    raise ValueError(f"{file_name} line {line_number}: {row[3]!r} is not an amount") from None
+                yield row[0],row[1],row[2],amount
+
+class LedgerLoader():
+    """
+    Class to build Rental objects, or portfolio entries, from ledger rows in a single pass.
+    Sources are lowercased and overwritten like add_income_source, add_expense, and add_investment,
+    but duplicates are counted instead of printing a warning for each one.
+    """
+    def __init__(self,portfolio=None) -> None:
+        # Rows go into this portfolio (anything with add_line_item, like RentalPortfolio) if given,
+        # otherwise into a dict of property to Rental
+        self.portfolio = portfolio
+        self.rentals = dict()
+        self.rows = 0
+        self.duplicates = 0
+        self.duplicates_by_property = Counter()
+        # Files that couldn't be read by load_summaries, by file name, with the reason
+        self.errors = dict()
+
+    def add_row(self,property_id,kind:str,source:str,amount):
+        """
+        Method to add a single ledger row
+        """
+        kind = kind.strip().lower()
+        if kind not in source_types:
+            raise ValueError(f"Ledger kind must be 'income', 'expense', or 'investment', not {kind!r}")
+        source = source.strip()
+        if self.portfolio is not None:
+            overwritten = self.portfolio.add_line_item(property_id,kind,source,float(amount))
+        else:
+            rental = self.rentals.get(property_id)
+            if rental is None:
+                rental = self.rentals[property_id] = Rental()
+            overwritten = rental.set_source(kind,source,amount)
+        self.rows += 1
+        if overwritten:
+            self.duplicates += 1
+            self.duplicates_by_property[property_id] += 1
+
+    def load_rows(self,rows):
+        """
+        Method to add every row from an iterable of (property, kind, source, amount) rows
+        """
+        for property_id,kind,source,amount in rows:
+            self.add_row(property_id,kind,source,amount)
+        return self
+
+    def load_file(self,file_name:str):
+        """
+        Method to stream every row of a CSV or JSONL ledger file
+        """
+        return self.load_rows(iter_ledger_rows(file_name))
+
+    def load_summary(self,file_name:str):
+        """
+        Method to add every summary in a file written by export_summary or export_summaries
+        """
+        return self.load_rows(_summary_ledger_rows(read_summary(file_name)))
+
+def load_ledger(*file_names:str,portfolio=None):
+    """
+    Function to load one or more ledger files. Returns the LedgerLoader, which holds the rentals
+    (or the portfolio), the number of rows read, and the number of duplicates that were overwritten.
+    """
+    loader = LedgerLoader(portfolio)
+    for file_name in file_names:
+        loader.load_file(file_name)
+    return loader
+
+# Section markers of export_summary files, and the kind of line item listed under each
+_summary_sections = {"INCOME":"income","EXPENSES":"expense","INVESTMENTS":"investment"}
+_summary_totals = {"income":"Total Monthly Income","expense":"Total Monthly Expense","investment":"Total Investment"}
+
+def _parse_money(text:str):
+    return float(text.replace(",",""))
+
+def _check_summary(property_name:str,totals_found:set,roi_found:bool):
+    """
+    Function to make sure a summary has the total row of every section and the ROI row, so a file
+    that was cut off is reported instead of loading as a property with missing line items
+    """
+    for kind,total_name in _summary_totals.items():
+        if kind not in totals_found:
+            raise ValueError(f"summary of {property_name!r} has no {total_name!r} row")
+    if not roi_found:
+        raise ValueError(f"summary of {property_name!r} has no 'Cash on Cash ROI' row")
+
+def parse_summary_rows(rows):
+    """
+    Function to parse the rows of one or more summaries written by export_summary or export_summaries,
+    as (property name, [(kind, source, amount), ...]) pairs. Raises ValueError if the rows aren't a summary,
+    if a summary is missing a section total or the ROI row, or if the line items of a section don't add up to its total.
+    Amounts in a summary are rounded to the cent, so that is all the precision a parsed line item has.
+    """
+    property_name = None
+    items = None
+    kind = None
+    # Whether the rows are in the line item list of the current section
+    listing = False
+    # Kinds whose total row has been checked, and whether the ROI row was found, in the current summary
+    totals_found = set()
+    roi_found = False
+    for line_number,row in enumerate(rows,1):
+        first = row[0] if row else ""
+        if first == "Rental Property Name":
+            if len(row) != 2:
+                raise ValueError(f"line {line_number}: property name row has {len(row)} columns")
+            if property_name is not None:
+                _check_summary(property_name,totals_found,roi_found)
+                yield property_name,items
+            property_name,items,kind,listing = row[1],[],None,False
+            totals_found,roi_found = set(),False
+        elif property_name is None:
+            if first:
+                raise ValueError(f"line {line_number}: expected a 'Rental Property Name' row")
+        elif first in _summary_sections:
+            kind = _summary_sections[first]
+            listing = False
+        elif first in ("CASHFLOW","CASH ON CASH ROI"):
+            kind = None
+        elif kind is None:
+            if len(row) == 2 and row[1] == "Cash on Cash ROI":
+                roi_found = True
+        elif not first:
+            listing = False
+        elif first.endswith("($)"):
+            # Column headers come right before the line items
+            listing = True
+        elif len(row) != 2:
+            raise ValueError(f"line {line_number}: expected an amount and a name, found {len(row)} columns")
+        else:
+            try:
+                amount = _parse_money(first)
+            except ValueError:
+                raise ValueError(f"line {line_number}: {first!r} is not an amount") from None
+            if listing:
+                items.append((kind,row[1],amount))
+            elif row[1] == _summary_totals[kind]:
+                listed = [item_amount for item_kind,_,item_amount in items if item_kind == kind]
+                # Every listed amount was rounded to the cent on its own, so allow half a cent each
+                if abs(sum(listed) - amount) > .005 * (len(listed) + 1):
+                    raise ValueError(f"line {line_number}: {kind} items add up to {sum(listed):,.2f}, not {first}")
+                totals_found.add(kind)
+    if property_name is None:
+        raise ValueError("no 'Rental Property Name' row found")
+    _check_summary(property_name,totals_found,roi_found)
+    yield property_name,items
+
+def read_summary(file_name:str):
+    """
+    Function to read every summary in a file written by export_summary or export_summaries.
+    Returns a list of (property name, [(kind, source, amount), ...]) pairs.
+    """
+    with open(file_name,newline="") as file:
+        try:
+            return list(parse_summary_rows(csv.reader(file)))
+        except ValueError as error:
+            raise ValueError(f"{file_name}: {error}") from None
+
+def _read_summary_files(file_names:list):
+    """
+    Function to read a batch of summary files. Returns (file name, summaries, error) for each file,
+    where error is the reason the file couldn't be read, or None.
+    """
+    results = []
+    for file_name in file_names:
+        try:
+            results.append((file_name,read_summary(file_name),None))
+        except (OSError,ValueError,UnicodeDecodeError,csv.Error) as error:
+            results.append((file_name,None,str(error)))
+    return results
+
+def _summary_ledger_rows(summaries):
+    """
+    Function to turn parsed summaries into (property, kind, source, amount) ledger rows
+    """
+    for property_name,items in summaries:
+        for kind,source,amount in items:
+            yield property_name,kind,source,amount
+
+def _add_summaries(loader:LedgerLoader,results):
+    """
+    Function to add the results of _read_summary_files to a LedgerLoader
+    """
+    for file_name,summaries,error in results:
+        if error is not None:
+            loader.errors[file_name] = error
+        else:
+            loader.load_rows(_summary_ledger_rows(summaries))
+
+def load_summaries(directory:str=".",suffix:str="_ValueEstimate.csv",portfolio=None,workers:int=None,chunk_size:int=64,
+                   loader:LedgerLoader=None):
+    """
+    Function to load every summary file in a directory (files whose names end in suffix) back into
+    Rental objects, or into portfolio if given. Files are parsed across a pool of worker processes,
+    chunk_size files at a time, if workers is set. Files that can't be parsed are skipped and listed in
+    the errors of the returned LedgerLoader. A property found in more than one summary has its line items
+    set again by the later one, which counts as duplicates like in load_ledger. Pass loader to add the
+    summaries to an existing LedgerLoader instead of a new one.
+    """
+    if loader is None:
+        loader = LedgerLoader(portfolio)
+    file_names = sorted(entry.path for entry in os.scandir(directory) if entry.is_file() and entry.name.endswith(suffix))
+    chunks = [file_names[i:i + chunk_size] for i in range(0,len(file_names),chunk_size)]
+    if workers:
+        # Imported here so loading ledgers doesn't pay for multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(workers) as pool:
+            # map keeps the chunks in order, and each chunk is added as soon as it is ready
+            results = itertools.chain.from_iterable(pool.map(_read_summary_files,chunks))
+            _add_summaries(loader,results)
+    else:
+        _add_summaries(loader,itertools.chain.from_iterable(map(_read_summary_files,chunks)))
+    return loader
@@ -0,0 +1,168 @@
+import numpy as np
+
+from rental_portfolio import as_portfolio
+from rental_projection import project
+
+# A cashflow series has one column per year, starting with year 0: the initial investment as a negative
+# amount, then each year's cashflow, with the sale proceeds added to the last year. Every function takes
+# an array of series, so the last axis is the year and any axes before it are properties or scenarios.
+
+def cashflow_series(rentals,years:int=10,sale_proceeds=None,**projection):
+    """
+    Function to build the cashflow series of one or many properties. rentals can be a Rental, a dict of Rentals,
+    or a RentalPortfolio. The initial investment is the total of each investment_dict and the yearly cashflows
+    come from project(), which gets years and any other keyword arguments (growth rates, property_value,
+    appreciation, mortgage). sale_proceeds (one value, or one per property) is added to the last year.
+    If it is left out, the projected equity in the last year is used when property_value is given, otherwise 0.
+    Returns an array shaped (scenario..., property, years + 1).
+    """
+    portfolio = as_portfolio(rentals)
+    projected = project(portfolio,years,**projection)
+    if sale_proceeds is None:
+        sale_proceeds = projected.equity[...,-1] if projected.equity is not None else 0.
+    series = np.zeros(projected.cashflow.shape[:-1] + (years + 1,))
+    series[...,0] = -portfolio.get_total_investment()
+    series[...,1:] = projected.cashflow
+    series[...,-1] += sale_proceeds
+    return series
+
+def npv(cashflows,rate):
+    """
+    Function to get the net present value of cashflow series at a yearly discount rate (.08 for 8%).
+    rate can be one rate or an array that broadcasts with the series, leaving out the year axis.
+    """
+    cashflows = np.asarray(cashflows,dtype=float)
+    discount = (1 + np.asarray(rate,dtype=float)[...,None]) ** -np.arange(cashflows.shape[-1])
+    return (cashflows * discount).sum(axis=-1)
+
+def equity_multiple(cashflows):
+    """
+    Function to get the equity multiple of cashflow series: the total cash received over the total cash put in.
+    nan where nothing was put in.
+    """
+    cashflows = np.asarray(cashflows,dtype=float)
+    received = np.where(cashflows > 0,cashflows,0.).sum(axis=-1)
+    put_in = -np.where(cashflows < 0,cashflows,0.).sum(axis=-1)
+    with np.errstate(divide="ignore",invalid="ignore"):
+        return np.where(put_in > 0,received / put_in,np.nan)
+
+def sign_changes(cashflows):
+    """
+    Function to count the sign changes in cashflow series, skipping zeros. By Descartes' rule of signs, a
+    series with one sign change has exactly one IRR, and a series with more may have several.
+    """
+    cashflows = np.asarray(cashflows,dtype=float)
+    signs = np.sign(cashflows)
+    # Carry the last non-zero sign forward over zeros, so a zero year doesn't count as a change
+    positions = np.where(signs != 0,np.arange(signs.shape[-1]),0)
+    np.maximum.accumulate(positions,axis=-1,out=positions)
+    signs = np.take_along_axis(signs,positions,axis=-1)
+    return ((signs[...,1:] * signs[...,:-1]) < 0).sum(axis=-1)
+
+def _npv_and_slope(cashflows,rate):
+    """
+    Function to get the NPV of 2D cashflow series and its derivative with respect to rate, by Horner's rule
+    in the discount factor x = 1 / (1 + rate)
+    """
+    x = 1 / (1 + rate)
+    value = cashflows[:,-1].copy()
+    slope = np.zeros_like(value)
+    for year in range(cashflows.shape[1] - 2,-1,-1):
+        slope = slope * x + value
+        value = value * x + cashflows[:,year]
+    # d(npv)/d(rate) = d(npv)/dx * dx/d(rate), and dx/d(rate) = -x ** 2
+    return value, -slope * x * x
+
+class IrrResult():
+    """
+    Class to hold the results of irr(). Each array has the shape of the series without the year axis.
+    irr is nan where converged is False: there was no sign change of NPV between low and high, or the
+    solver ran out of iterations. multiple_roots marks series with more than one sign change in their cashflows,
+    which may have more than one IRR; irr holds the one the solver found between low and high.
+    """
+    def __init__(self,irr,converged,multiple_roots,iterations) -> None:
+        self.irr = irr
+        self.converged = converged
+        self.multiple_roots = multiple_roots
+        self.iterations = iterations
+
+def irr(cashflows,low:float=-.99,high:float=10.,guess:float=.1,tolerance:float=1e-10,max_iterations:int=100):
+    """
+    Function to get the internal rate of return (.08 for 8%) of many cashflow series at once. Each series is
+    solved with Newton's method from guess, kept inside a bracket [low, high] where NPV changes sign and falling
+    back to bisection whenever a Newton step would leave the bracket, so it always makes progress.
+    Series drop out of the arrays as they converge, so the remaining work shrinks every iteration.
+    Returns an IrrResult.
+    """
+    cashflows = np.asarray(cashflows,dtype=float)
+    shape = cashflows.shape[:-1]
+    flat = cashflows.reshape(-1,cashflows.shape[-1])
+    n = len(flat)
+    result = np.full(n,np.nan)
+    converged = np.zeros(n,dtype=bool)
+
+    low_value,_ = _npv_and_slope(flat,np.full(n,low))
+    high_value,_ = _npv_and_slope(flat,np.full(n,high))
+    active = np.flatnonzero(np.sign(low_value) != np.sign(high_value))
+    # A bracket end that is already a root
+    for end,end_value in ((low,low_value),(high,high_value)):
+        exact = end_value == 0
+        result[exact] = end
+        converged[exact] = True
+        active = active[~exact[active]]
+
+    series = flat[active]
+    lows = np.full(len(active),low)
+    highs = np.full(len(active),high)
+    low_values = low_value[active]
+    rate = np.full(len(active),min(max(guess,low),high))
+    iterations = 0
+    while len(active) and iterations < max_iterations:
+        iterations += 1
+        value,slope = _npv_and_slope(series,rate)
+        # The current rate is already a root, so it is the answer and the bracket stays as it is
+        exact = value == 0
+        result[active[exact]] = rate[exact]
+        converged[active[exact]] = True
+
+        # Shrink the bracket to the side that still has the sign change
+        same_side = np.sign(value) == np.sign(low_values)
+        lows = np.where(same_side,rate,lows)
+        low_values = np.where(same_side,value,low_values)
+        highs = np.where(same_side,highs,rate)
+
+        with np.errstate(divide="ignore",invalid="ignore"):
+            step = rate - value / slope
+        bisect = ~((step > lows) & (step < highs))
+        step = np.where(bisect,(lows + highs) / 2,step)
+        stepped = ~exact & (np.abs(step - rate) <= tolerance * (1 + np.abs(rate)))
+        rate = step
+
+        result[active[stepped]] = rate[stepped]
+        converged[active[stepped]] = True
+        done = exact | stepped
+        keep = ~done
+        active,series,rate,lows,highs,low_values = active[keep],series[keep],rate[keep],lows[keep],highs[keep],low_values[keep]
+
+    multiple_roots = sign_changes(flat) > 1
+    return IrrResult(result.reshape(shape),converged.reshape(shape),multiple_roots.reshape(shape),iterations)
+
+class Returns():
+    """
+    Class to hold the results of returns(). Each array has one value per property (with any scenario axes first).
+    """
+    def __init__(self,cashflows,irr_result:IrrResult,npv,equity_multiple) -> None:
+        self.cashflows = cashflows
+        self.irr = irr_result.irr
+        self.converged = irr_result.converged
+        self.multiple_roots = irr_result.multiple_roots
+        self.npv = npv
+        self.equity_multiple = equity_multiple
+
+def returns(rentals,discount_rate=.08,years:int=10,sale_proceeds=None,**projection):
+    """
+    Function to get the IRR, NPV at discount_rate, and equity multiple of one or many properties, held for years
+    and then sold. See cashflow_series for the other arguments. Returns a Returns.
+    """
+    cashflows = cashflow_series(rentals,years,sale_proceeds,**projection)
+    return Returns(cashflows,irr(cashflows),npv(cashflows,discount_rate),equity_multiple(cashflows))
@@ -0,0 +1,286 @@
+from array import array
+
+import numpy as np
+
+from rental_property_program import Rental
+
+def compensated_bincount(bins,amounts,size:int):
+    """
+    Function to sum amounts into bins with the same Neumaier compensated summation as RunningTotal.
+    Items are added to each bin in array order. Every step handles the k-th item of all bins at once,
+    so the number of Python iterations is the largest number of items in a single bin.
+    """
+    total = np.zeros(size)
+    compensation = np.zeros(size)
+    if not len(bins):
+        return total
+    order = np.argsort(bins,kind="stable")
+    sorted_bins = bins[order]
+    # Rank of each item within its bin, 0 for the first item added
+    rank = np.arange(len(bins)) - np.searchsorted(sorted_bins,sorted_bins,side="left")
+    by_rank = order[np.argsort(rank,kind="stable")]
+    offsets = np.concatenate(([0],np.cumsum(np.bincount(rank))))
+    for start,stop in zip(offsets[:-1],offsets[1:]):
+        items = by_rank[start:stop]
+        # Each bin shows up at most once per rank, so fancy indexed updates don't collide
+        b = bins[items]
+        amount = amounts[items]
+        previous = total[b]
+        new_total = previous + amount
+        compensation[b] += np.where(np.abs(previous) >= np.abs(amount),(previous - new_total) + amount,(amount - new_total) + previous)
+        total[b] = new_total
+    return total + compensation
+
+class RentalPortfolio():
+    """
+    Class to store income, expenses, and investments for many rental properties at once.
+    Line items are kept in flat columns so cashflow and ROI can be computed for every
+    property in a few array operations instead of one Rental at a time.
+    """
+    source_types = ("income","expense","investment")
+
+    def __init__(self) -> None:
+        # Property ids in the order they were added. Row i of every result belongs to property_ids[i]
+        self.property_ids = []
+        self._rows = dict()
+        # Positions of the line items of each property, by row
+        self._property_items = []
+        # Shared table of source names, so "rent" is only stored once for the whole portfolio
+        self.source_names = []
+        self._source_ids = dict()
+        # One entry per line item
+        self._item_property = array("q")
+        self._item_type = array("b")
+        self._item_source = array("q")
+        self._item_amount = array("d")
+        self._item_alive = array("b")
+        # (row, source type code, source id) -> position of the line item in the columns above
+        self._item_positions = dict()
+        # Loans attached to Rentals with add_loan, by property id and then by the expense that holds their payment
+        self.loans = dict()
+        self._totals = None
+
+    def __len__(self):
+        return len(self.property_ids)
+
+    def __contains__(self,property_id):
+        return property_id in self._rows
+
+    def _source_type_code(self,source_type:str):
+        """
+        Method to turn 'income', 'expense', or 'investment' into its column code
+        """
+        try:
+            return self.source_types.index(source_type)
+        except ValueError:
+            raise ValueError(f"source_type must be 'income', 'expense', or 'investment', not {source_type!r}") from None
+
+    def _source_id(self,source:str):
+        """
+        Method to get the id of a source name, adding it to the source name table if needed
+        """
+        source_id = self._source_ids.get(source)
+        if source_id is None:
+            source_id = len(self.source_names)
+            self._source_ids[source] = source_id
+            self.source_names.append(source)
+        return source_id
+
+    def get_source_id(self,source:str):
+        """
+        Method to get the id of a source name in source_names, or None if no property has that source
+        """
+        return self._source_ids.get(source.lower())
+
+    def add_property(self,property_id):
+        """
+        Method to add an empty property. Returns the row of the property.
+        """
+        row = self._rows.get(property_id)
+        if row is None:
+            row = len(self.property_ids)
+            self._rows[property_id] = row
+            self.property_ids.append(property_id)
+            self._property_items.append([])
+            self._totals = None
+        return row
+
+    def row_of(self,property_id):
+        """
+        Method to get the row of a property id
+        """
+        return self._rows[property_id]
+
+    def add_line_item(self,property_id:str,source_type:str,source:str,amount:float):
+        """
+        Method to add or overwrite a line item of a property. The property is added if needed.
+        Source names are lowercased like Rental does. Returns True if an existing line item was overwritten.
+        """
+        row = self.add_property(property_id)
+        key = (row,self._source_type_code(source_type),self._source_id(source.lower()))
+        self._totals = None
+        position = self._item_positions.get(key)
+        if position is not None:
+            self._item_amount[position] = float(amount)
+            return True
+        position = len(self._item_amount)
+        self._item_positions[key] = position
+        self._property_items[row].append(position)
+        self._item_property.append(row)
+        self._item_type.append(key[1])
+        self._item_source.append(key[2])
+        self._item_amount.append(float(amount))
+        self._item_alive.append(1)
+        return False
+
+    def remove_line_item(self,property_id:str,source_type:str,source:str):
+        """
+        Method to remove a line item of a property
+        """
+        key = (self._rows[property_id],self._source_type_code(source_type),self._source_ids.get(source.lower()))
+        position = self._item_positions.pop(key)
+        # Removed items stay in the columns with no weight, so positions of other items don't change
+        self._item_amount[position] = 0.
+        self._item_alive[position] = 0
+        self._totals = None
+        if key[1] == 1 and property_id in self.loans:
+            self.loans[property_id].pop(source.lower(),None)
+
+    def add_rental(self,property_id,rental:Rental):
+        """
+        Method to add every line item of a Rental, and its loans, under the given property id
+        """
+        self.add_property(property_id)
+        for source_type,source_dict in zip(self.source_types,(rental.income_dict,rental.expense_dict,rental.investment_dict)):
+            for source,amount in source_dict.items():
+                self.add_line_item(property_id,source_type,source,amount)
+        if rental.loan_dict:
+            self.loans.setdefault(property_id,dict()).update(rental.loan_dict)
+
+    @classmethod
+    def from_rentals(cls,rentals):
+        """
+        Method to build a portfolio from a dict of property id to Rental, or an iterable of (property id, Rental) pairs
+        """
+        portfolio = cls()
+        if isinstance(rentals,dict):
+            rentals = rentals.items()
+        for property_id,rental in rentals:
+            portfolio.add_rental(property_id,rental)
+        return portfolio
+
+    def get_rental(self,property_id) -> Rental:
+        """
+        Method to extract a single property as a standalone Rental
+        """
+        rental = Rental()
+        setters = (rental.update_income_source,rental.update_expense,rental.update_investment)
+        # Positions are in the order items were added, which keeps the dicts in the same order as the original Rental
+        for position in self._property_items[self._rows[property_id]]:
+            if self._item_alive[position]:
+                source_name = self.source_names[self._item_source[position]]
+                setters[self._item_type[position]](source_name,self._item_amount[position])
+        rental.loan_dict.update(self.loans.get(property_id,()))
+        return rental
+
+    def rentals(self):
+        """
+        Method to iterate over (property id, Rental) pairs for every property
+        """
+        for property_id in self.property_ids:
+            yield property_id, self.get_rental(property_id)
+
+    def columns(self):
+        """
+        Method to get the live line items as NumPy arrays: (property row, source type code, source id, amount)
+        """
+        alive = np.frombuffer(self._item_alive,dtype=np.int8).astype(bool)
+        return (
+            np.frombuffer(self._item_property,dtype=np.int64)[alive],
+            np.frombuffer(self._item_type,dtype=np.int8)[alive],
+            np.frombuffer(self._item_source,dtype=np.int64)[alive],
+            np.frombuffer(self._item_amount,dtype=np.float64)[alive],
+        )
+
+    def get_line_amounts(self,source_type:str,source:str):
+        """
+        Method to get the amount of one line item for every property, 0 for properties without it
+        """
+        rows,type_codes,source_ids,amounts = self.columns()
+        matches = (type_codes == self._source_type_code(source_type)) & (source_ids == self.get_source_id(source))
+        return np.bincount(rows[matches],weights=amounts[matches],minlength=len(self))
+
+    def get_totals(self):
+        """
+        Method to get an (n properties, 3) array of monthly income, monthly expenses and total investment
+        """
+        if self._totals is None:
+            n = len(self.property_ids)
+            rows,type_codes,_,amounts = self.columns()
+            # Combining row and source type gives one bin per (property, type), so one pass sums every column.
+            # Items are summed in the order they were added with the same compensation Rental uses.
+            bins = rows * 3 + type_codes
+            self._totals = compensated_bincount(bins,amounts,3 * n).reshape(n,3)
+        return self._totals
+
+    def get_monthly_income(self):
+        """
+        Method to get monthly income of every property
+        """
+        return self.get_totals()[:,0]
+
+    def get_monthly_expenses(self):
+        """
+        Method to get monthly expenses of every property
+        """
+        return self.get_totals()[:,1]
+
+    def get_total_investment(self):
+        """
+        Method to get total investment of every property
+        """
+        return self.get_totals()[:,2]
+
+    def get_yearly_income(self):
+        """
+        Method to get yearly income of every property
+        """
+        return self.get_monthly_income() * 12
+
+    def get_yearly_expenses(self):
+        """
+        Method to get yearly expenses of every property
+        """
+        return self.get_monthly_expenses() * 12
+
+    def get_monthly_cashflow(self):
+        """
+        Method to get monthly cashflow of every property
+        """
+        return self.get_monthly_income() - self.get_monthly_expenses()
+
+    def get_yearly_cashflow(self):
+        """
+        Method to get yearly cashflow of every property
+        """
+        return self.get_monthly_cashflow() * 12
+
+    def get_yearly_roi(self):
+        """
+        Method to get yearly cash on cash return on investment of every property, as an unrounded percentage.
+        Properties without any investment get inf (or nan if their cashflow is also zero) instead of raising.
+        """
+        with np.errstate(divide="ignore",invalid="ignore"):
+            return self.get_yearly_cashflow() * 100 / self.get_total_investment()
+
+def as_portfolio(rentals):
+    """
+    Function to turn a Rental, a dict of property id to Rental, or (property id, Rental) pairs into a
+    RentalPortfolio. A RentalPortfolio is returned as is.
+    """
+    if isinstance(rentals,RentalPortfolio):
+        return rentals
+    # Anything with the Rental dicts counts as a single rental, so CompactRental works too
+    if hasattr(rentals,"income_dict"):
+        return RentalPortfolio.from_rentals({0:rentals})
+    return RentalPortfolio.from_rentals(rentals)
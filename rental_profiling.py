@@ -0,0 +1,265 @@
+import contextlib
+import functools
+import inspect
+import os
+import sys
+import time
+
+from rental_compact import CompactRental
+import rental_export
+import rental_property_program
+from rental_property_program import CentsRental, Rental, summary_file_name
+
+# Classes whose public methods are timed. CompactRental copies Rental's functions when it is created,
+# so patching Rental doesn't reach it and it is patched on its own.
+_rental_classes = (Rental,CentsRental,CompactRental)
+
+# name -> [calls, cumulative seconds]
+stats = dict()
+# name -> {"files":..., "bytes":..., "seconds":...}
+io_stats = dict()
+# (owner, attribute name, original) of everything patched by enable(), so disable() can put it back
+_patched = []
+# Names of the timed calls in progress, innermost last, so a sleep can be put down to the helper that asked for it
+_stack = []
+
+def _record(name:str,seconds:float):
+    """
+    Function to add a call and its time to stats
+    """
+    entry = stats.get(name)
+    if entry is None:
+        entry = stats[name] = [0,0.]
+    entry[0] += 1
+    entry[1] += seconds
+
+def _timed(name:str,function):
+    """
+    Function to wrap a function so every call adds to its count and cumulative time
+    """
+    @functools.wraps(function)
+    def wrapper(*args,**kwargs):
+        _stack.append(name)
+        start = time.perf_counter()
+        try:
+            return function(*args,**kwargs)
+        finally:
+            _record(name,time.perf_counter() - start)
+            _stack.pop()
+    return wrapper
+
+def _timed_helper(name:str,function):
+    """
+    Function to wrap one of the calculator's helper functions, passed to rental_property_program.helper_wrapper
+    """
+    return _timed(f"calculator.{name}",function)
+
+def _timed_sleep(function):
+    """
+    Function to wrap sleep so the typing effects of p() and the pauses of every other helper, like the
+    pauses between sections of summary(), are recorded under separate names
+    """
+    @functools.wraps(function)
+    def wrapper(seconds:float):
+        helper = next((name for name in reversed(_stack) if name.startswith("calculator.")),None)
+        if helper is None:
+            name = "sleep"
+        elif helper == "calculator.p":
+            name = "sleep (typing effects in p)"
+        else:
+            name = f"sleep (pauses in {helper[len('calculator.'):]})"
+        start = time.perf_counter()
+        try:
+            return function(seconds)
+        finally:
+            _record(name,time.perf_counter() - start)
+    return wrapper
+
+def _formatting_seconds():
+    """
+    Function to get the time spent in summary_rows so far, by every Rental class. Summaries are built
+    with summary_rows, which is timed on its own while enabled, and building them is mostly money formatting.
+    """
+    return sum(stats.get(f"{cls.__name__}.summary_rows",(0,0.))[1] for cls in _rental_classes)
+
+def _record_export(name:str,io_name:str,seconds:float,formatting:float,files:int,file_names):
+    """
+    Function to record the time of an export split into money formatting and writing, and the files,
+    bytes, and writing time under io_stats[io_name]
+    """
+    _record(name,seconds)
+    _record(f"{name} (money formatting)",formatting)
+    _record(f"{name} (CSV write)",seconds - formatting)
+    entry = io_stats.setdefault(io_name,{"files":0,"bytes":0,"seconds":0.})
+    entry["files"] += files
+    entry["seconds"] += seconds - formatting
+    for file_name in file_names:
+        with contextlib.suppress(OSError):
+            entry["bytes"] += os.path.getsize(file_name)
+
+def _timed_export(cls):
+    """
+    Function to wrap the export_summary of a Rental class so it also records files, bytes, and time spent writing.
+    The files of every class are added up under io_stats["export_summary"].
+    """
+    function = cls.export_summary
+    @functools.wraps(function)
+    def wrapper(self,property_name:str):
+        formatting_before = _formatting_seconds()
+        start = time.perf_counter()
+        try:
+            return function(self,property_name)
+        finally:
+            _record_export(f"{cls.__name__}.export_summary","export_summary",time.perf_counter() - start,_formatting_seconds() - formatting_before,
+                           1,[summary_file_name(property_name)])
+    return wrapper
+
+def _timed_write_summary_files(function):
+    """
+    Function to wrap rental_export._write_summary_files, which writes the files of export_summaries
+    and of evaluate_sharded, so it records files, bytes, and time like export_summary
+    """
+    @functools.wraps(function)
+    def wrapper(properties,directory:str,buffer_size:int):
+        formatting_before = _formatting_seconds()
+        start = time.perf_counter()
+        count = 0
+        try:
+            count = function(properties,directory,buffer_size)
+            return count
+        finally:
+            file_names = [os.path.join(directory,summary_file_name(property_name)) for property_name,_ in properties[:count]]
+            _record_export("export_summaries","export_summaries",time.perf_counter() - start,_formatting_seconds() - formatting_before,count,file_names)
+    return wrapper
+
+def _timed_render_summaries(function):
+    """
+    Function to wrap rental_export.render_summaries, which renders the single file layout, so the time
+    is split into money formatting and CSV rendering. The single file is recorded by export_summaries.
+    """
+    @functools.wraps(function)
+    def wrapper(properties):
+        formatting_before = _formatting_seconds()
+        start = time.perf_counter()
+        try:
+            return function(properties)
+        finally:
+            seconds = time.perf_counter() - start
+            formatting = _formatting_seconds() - formatting_before
+            _record("render_summaries",seconds)
+            _record("render_summaries (money formatting)",formatting)
+            _record("render_summaries (CSV rendering)",seconds - formatting)
+    return wrapper
+
+def _timed_export_summaries(function):
+    """
+    Function to wrap rental_export.export_summaries so its whole time is recorded, and the file it writes
+    with the single file layout is recorded under io_stats like the files of the other layout
+    """
+    signature = inspect.signature(function)
+    @functools.wraps(function)
+    def wrapper(*args,**kwargs):
+        arguments = signature.bind(*args,**kwargs)
+        arguments.apply_defaults()
+        directory,layout,file_name = (arguments.arguments[name] for name in ("directory","layout","file_name"))
+        rendering_before = stats.get("render_summaries",(0,0.))[1]
+        start = time.perf_counter()
+        try:
+            return function(*args,**kwargs)
+        finally:
+            seconds = time.perf_counter() - start
+            _record("export_summaries (total)",seconds)
+            if layout == "single":
+                entry = io_stats.setdefault("export_summaries (single file)",{"files":0,"bytes":0,"seconds":0.})
+                entry["files"] += 1
+                entry["seconds"] += seconds - (stats.get("render_summaries",(0,0.))[1] - rendering_before)
+                with contextlib.suppress(OSError):
+                    entry["bytes"] += os.path.getsize(os.path.join(directory,file_name))
+    return wrapper
+
+def _patch(owner,name:str,replacement):
+    """
+    Function to replace an attribute and remember the original
+    """
+    _patched.append((owner,name,getattr(owner,name)))
+    setattr(owner,name,replacement)
+
+def is_enabled():
+    """
+    Function to check if instrumentation is on
+    """
+    return bool(_patched)
+
+def enable():
+    """
+    Function to turn instrumentation on. Every public method of Rental, CentsRental, and CompactRental,
+    export_summary and the batch export of rental_export (split into money formatting and CSV writing,
+    with files, bytes, and writing time), the calculator and its helpers (p, format_money, get_valid_money,
+    get_y_or_n, add_source, update_source, remove_source, summary, and the rest), and its sleeps are counted
+    and timed. Sleeps are recorded by the helper they happen in, so the typing effects of p() and the pauses of
+    summary() show up separately. Helper times include the helpers they call. Nothing is wrapped while
+    instrumentation is off, so it costs nothing then. Calls are only seen through the modules that define them,
+    not through names imported from them before enable() was called. Work done in worker processes, like
+    export_summaries and evaluate_sharded with workers, is recorded in those processes and doesn't show up here;
+    only the total time of export_summaries does.
+    """
+    if is_enabled():
+        return
+    for cls in _rental_classes:
+        for name,attribute in list(vars(cls).items()):
+            if name.startswith("_") or not callable(attribute) or isinstance(attribute,(staticmethod,classmethod,property)):
+                continue
+            if name == "export_summary":
+                _patch(cls,name,_timed_export(cls))
+            else:
+                _patch(cls,name,_timed(f"{cls.__name__}.{name}",attribute))
+    _patch(rental_export,"_write_summary_files",_timed_write_summary_files(rental_export._write_summary_files))
+    _patch(rental_export,"render_summaries",_timed_render_summaries(rental_export.render_summaries))
+    _patch(rental_export,"export_summaries",_timed_export_summaries(rental_export.export_summaries))
+    # The calculator's helpers are local functions, but they look these module globals up on every call
+    _patch(rental_property_program,"sleep",_timed_sleep(rental_property_program.sleep))
+    _patch(rental_property_program,"helper_wrapper",_timed_helper)
+    _patch(rental_property_program,"rental_property_calculator",_timed("rental_property_calculator",rental_property_program.rental_property_calculator))
+    _patch(rental_property_program,"run_headless",_timed("run_headless",rental_property_program.run_headless))
+
+def disable():
+    """
+    Function to turn instrumentation off and put the original functions back. Recorded numbers are kept.
+    """
+    while _patched:
+        owner,name,original = _patched.pop()
+        setattr(owner,name,original)
+
+def reset():
+    """
+    Function to clear every recorded number
+    """
+    stats.clear()
+    io_stats.clear()
+
+def report():
+    """
+    Function to get the recorded numbers as a table, slowest first
+    """
+    lines = [f"{'Cumulative (s)':>14}  {'Calls':>10}  {'Per call (s)':>12}  Name"]
+    for name,(calls,seconds) in sorted(stats.items(),key=lambda item: item[1][1],reverse=True):
+        lines.append(f"{seconds:>14.6f}  {calls:>10,}  {seconds / calls:>12.3g}  {name}")
+    for name,entry in io_stats.items():
+        rate = entry["bytes"] / entry["seconds"] / 1e6 if entry["seconds"] else 0.
+        lines.append(f"\n{name} I/O: {entry['files']:,} files, {entry['bytes']:,} bytes in {entry['seconds']:.6f} s ({rate:.2f} MB/s)")
+    return "\n".join(lines)
+
+@contextlib.contextmanager
+def profiled(file=None):
+    """
+    Context manager that turns instrumentation on for a block and writes the report to file
+    (standard error by default) at the end
+    """
+    was_enabled = is_enabled()
+    enable()
+    try:
+        yield
+    finally:
+        if not was_enabled:
+            disable()
+        print(report(),file=file or sys.stderr)
@@ -0,0 +1,111 @@
+import numpy as np
+
+from rental_financing import Loan, monthly_payment, remaining_balance
+from rental_portfolio import as_portfolio
+
+# A projection's mortgage is a Loan from rental_financing
+Mortgage = Loan
+
+class Projection():
+    """
+    Class to hold the results of project(). Every array has the shape of the broadcast scenario
+    assumptions, followed by one axis for the properties and one axis for the years.
+    """
+    def __init__(self,years,cashflow,equity,cumulative_cashflow,cumulative_roi) -> None:
+        self.years = years
+        self.cashflow = cashflow
+        self.equity = equity
+        self.cumulative_cashflow = cumulative_cashflow
+        self.cumulative_roi = cumulative_roi
+
+def project(rentals,years:int=30,income_growth=0.,expense_growth=0.,source_growth:dict=None,
+            property_value=None,appreciation=0.,mortgage:Mortgage=None):
+    """
+    Function to project yearly cashflow, equity, and cumulative cash on cash ROI of one or many properties.
+    rentals can be a Rental, a dict of Rentals, or a RentalPortfolio.
+    income_growth and expense_growth are yearly growth rates for every income and expense source.
+    source_growth maps a source name to its own yearly growth rate, overriding the defaults.
+    property_value (one value, or one per property) and appreciation give the value used for equity.
+    A mortgage payment is added to expenses for the term of the loan and does not grow. Do not also
+    list the mortgage as an expense, or it will be counted twice. Loans attached with Rental.add_loan
+    are projected the same way: their payment expense doesn't grow, stops at the end of the term,
+    and the balance left on the loan is taken off equity.
+    Growth rates, appreciation, and the mortgage rate can be arrays. They are broadcast together into a
+    grid of scenarios, so np.linspace(0,.05,6)[:,None] and np.linspace(0,.03,4) give 6 x 4 scenarios.
+    Returns a Projection.
+    """
+    portfolio = as_portfolio(rentals)
+    source_growth = source_growth or dict()
+    n = len(portfolio)
+    rows,type_codes,source_ids,amounts = portfolio.columns()
+
+    # Every line item falls into a growth class: 0 for default income, 1 for default expenses,
+    # and one class per source with its own rate. Summing each class per property up front
+    # means the yearly math only runs over a handful of classes, not every line item.
+    class_rates = [income_growth,expense_growth]
+    class_signs = [1.,-1.]
+    item_class = np.where(type_codes == 0,0,1)
+    for source,rate in source_growth.items():
+        source_id = portfolio.get_source_id(source)
+        if source_id is None:
+            continue
+        for type_code,sign in ((0,1.),(1,-1.)):
+            matches = (source_ids == source_id) & (type_codes == type_code)
+            if matches.any():
+                item_class[matches] = len(class_rates)
+                class_rates.append(rate)
+                class_signs.append(sign)
+    cashflow_items = type_codes != 2
+    # Loan payment expenses are left out of the growth classes and paid for the term of their loan below
+    loans = [(portfolio.row_of(property_id),source,loan) for property_id,property_loans in portfolio.loans.items()
+             for source,loan in property_loans.items()]
+    if loans:
+        n_sources = len(portfolio.source_names)
+        loan_keys = [row * n_sources + portfolio.get_source_id(source) for row,source,_ in loans]
+        cashflow_items &= ~((type_codes == 1) & np.isin(rows * n_sources + source_ids,loan_keys))
+    n_classes = len(class_rates)
+    bins = rows[cashflow_items] * n_classes + item_class[cashflow_items]
+    base = np.bincount(bins,weights=amounts[cashflow_items],minlength=n * n_classes).reshape(n,n_classes)
+    base *= 12 * np.array(class_signs)
+
+    scenario_shape = np.broadcast_shapes(*(np.shape(rate) for rate in class_rates),np.shape(appreciation),
+                                         np.shape(mortgage.annual_rate) if mortgage else ())
+    year_index = np.arange(years)
+    # (scenario..., class, year) growth factors
+    rates = np.stack([np.broadcast_to(rate,scenario_shape) for rate in class_rates],axis=-1)
+    factors = (1 + rates[...,None]) ** year_index
+    cashflow = base @ factors
+
+    months_paid = (year_index + 1) * 12
+    if mortgage is not None:
+        principal = np.broadcast_to(np.asarray(mortgage.principal,dtype=float),(n,))
+        annual_rate = np.asarray(mortgage.annual_rate,dtype=float)[...,None,None]
+        payment = monthly_payment(principal[:,None],annual_rate,mortgage.years)
+        cashflow = cashflow - np.where(year_index < mortgage.years,payment * 12,0.)
+        balance = remaining_balance(principal[:,None],annual_rate,mortgage.years,months_paid)
+    else:
+        balance = 0.
+    if loans:
+        # (loan, year) payments and balances, summed into the rows of the properties that have the loans
+        loan_rows = np.array([row for row,_,_ in loans])
+        principal,annual_rate,term = (np.array([getattr(loan,name) for _,_,loan in loans],dtype=float)[:,None]
+                                      for name in ("principal","annual_rate","years"))
+        payments = np.where(year_index < term,monthly_payment(principal,annual_rate,term) * 12,0.)
+        loan_payments = np.zeros((n,years))
+        np.add.at(loan_payments,loan_rows,payments)
+        loan_balance = np.zeros((n,years))
+        np.add.at(loan_balance,loan_rows,remaining_balance(principal,annual_rate,term,months_paid))
+        cashflow = cashflow - loan_payments
+        balance = balance + loan_balance
+
+    if property_value is not None:
+        value = np.broadcast_to(np.asarray(property_value,dtype=float),(n,))[:,None]
+        growth = (1 + np.asarray(appreciation,dtype=float)[...,None,None]) ** (year_index + 1)
+        equity = np.broadcast_to(value * growth - balance,cashflow.shape)
+    else:
+        equity = None
+
+    cumulative_cashflow = np.cumsum(cashflow,axis=-1)
+    with np.errstate(divide="ignore",invalid="ignore"):
+        cumulative_roi = cumulative_cashflow * 100 / portfolio.get_total_investment()[:,None]
+    return Projection(year_index + 1,cashflow,equity,cumulative_cashflow,cumulative_roi)
@@ -1,6 +1,45 @@
+from array import array
 from time import sleep
+from types import MappingProxyType
+import contextlib
+import hashlib
 import sys
 import csv
+import io
+import itertools
+
+class RunningTotal():
+    """
+    Class to keep a running total of amounts that can be added and taken away again.
+    Uses Neumaier compensated summation so floating point error can't build up over many updates.
+    """
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self):
+        """
+        Method to set the total back to zero
+        """
+        self.total = 0.
+        self.compensation = 0.
+
+    def add(self,amount:float):
+        """
+        Method to add an amount to the total. Use a negative amount to take it away.
+        """
+        total = self.total + amount
+        # Keep track of the low-order bits lost when adding, so they can be put back in value()
+        if abs(self.total) >= abs(amount):
+            self.compensation += (self.total - total) + amount
+        else:
+            self.compensation += (amount - total) + self.total
+        self.total = total
+
+    def value(self):
+        """
+        Method to get the total
+        """
+        return self.total + self.compensation
 
 class Rental():
     """
@@ -10,72 +49,155 @@ class Rental():
         self.income_dict = dict()
         self.expense_dict = dict()
         self.investment_dict = dict()
+        # Loans attached with add_loan, by the name of the expense that holds their payment
+        self.loan_dict = dict()
+        # Running totals of each dict, kept up to date by the add, update, and remove methods
+        self._totals = {
+            "income":RunningTotal(),
+            "expense":RunningTotal(),
+            "investment":RunningTotal(),
+        }
+        # Content hash of the dicts, worked out when first asked for and cleared by any change
+        self._fingerprint = None
+
+    def _source_dict(self,source_type:str):
+        """
+        Method to get the dict for 'income', 'expense', or 'investment'
+        """
+        if source_type == "income":
+            return self.income_dict
+        if source_type == "expense":
+            return self.expense_dict
+        if source_type == "investment":
+            return self.investment_dict
+        raise KeyError(source_type)
+
+    def _set_amount(self,source_type:str,source:str,amount:float):
+        """
+        Method to set the amount of a source and keep the running total in sync.
+        Returns the previous amount, or None if the source is new.
+        """
+        source_dict = self._source_dict(source_type)
+        total = self._totals[source_type]
+        previous = source_dict.get(source)
+        if previous is not None:
+            total.add(-previous)
+        source_dict[source] = amount
+        total.add(amount)
+        self._fingerprint = None
+        return previous
+
+    def _remove_amount(self,source_type:str,source:str):
+        """
+        Method to remove a source and keep the running total in sync
+        """
+        source_dict = self._source_dict(source_type)
+        amount = source_dict.pop(source)
+        self._fingerprint = None
+        if source_dict:
+            self._totals[source_type].add(-amount)
+        else:
+            # Nothing left, so start the total over instead of carrying leftover rounding
+            self._totals[source_type].reset()
+
+    def set_source(self,source_type:str,source:str,amount:float):
+        """
+        Method to add or overwrite an 'income', 'expense', or 'investment' source without printing a warning.
+        Returns True if an existing source was overwritten.
+        """
+        return self._set_amount(source_type,source.lower(),float(amount)) is not None
+
+    def fingerprint(self):
+        """
+        Method to get a hash of the income, expense, and investment dicts. Rentals with the same sources,
+        amounts, and order of sources have the same fingerprint.
+        """
+        if self._fingerprint is None:
+            content = repr((tuple(self.income_dict.items()),tuple(self.expense_dict.items()),tuple(self.investment_dict.items())))
+            self._fingerprint = hashlib.blake2b(content.encode(),digest_size=16).hexdigest()
+        return self._fingerprint
 
     def add_income_source(self,source:str,amount:float):
         """
         Method to add a source of income.
         """
         source = source.lower()
-        if source in self.income_dict:
+        previous = self._set_amount("income",source,float(amount))
+        if previous is not None:
             print("Warning, source was already in income dict")
-            print(f"Changed income amount of {source} from {self.income_dict[source]} to {amount}")
-        self.income_dict[source] = float(amount)
+            print(f"Changed income amount of {source} from {previous} to {amount}")
 
     def add_expense(self,source:str,amount:float):
         """
         Method to add an expense.
         """
         source = source.lower()
-        if source in self.expense_dict:
+        previous = self._set_amount("expense",source,float(amount))
+        if previous is not None:
             print("Warning, source was already in expense dict")
-            print(f"Changed expense amount of {source} from {self.expense_dict[source]} to {amount}")
-        self.expense_dict[source] = float(amount)
+            print(f"Changed expense amount of {source} from {previous} to {amount}")
     
     def add_investment(self,source:str,amount:float):
         """
         Method to add an investment.
         """
         source = source.lower()
-        if source in self.income_dict:
+        previous = self._set_amount("investment",source,float(amount))
+        if previous is not None:
             print("Warning, source was already in investment dict")
-            print(f"Changed expense amount of {source} from {self.investment_dict[source]} to {amount}")
-        self.investment_dict[source] = float(amount)
+            print(f"Changed expense amount of {source} from {previous} to {amount}")
 
     def update_income_source(self,source:str,amount:float):
         """
         Method to update dollar amount of income source
         """
-        self.income_dict[source.lower()] = float(amount)
+        self._set_amount("income",source.lower(),float(amount))
 
     def update_expense(self,source:str,amount:float):
         """
         Method to update dollar amount of expense
         """
-        self.expense_dict[source.lower()] = float(amount)
+        self._set_amount("expense",source.lower(),float(amount))
 
     def update_investment(self,source:str,amount:float):
         """
         Method to update dollar amount of investment
         """
-        self.investment_dict[source.lower()] = float(amount)
+        self._set_amount("investment",source.lower(),float(amount))
     
+    def add_loan(self,source:str,loan):
+        """
+        Method to add a loan, like a rental_financing.Loan. Its monthly payment is added as an expense
+        named source, so it counts towards the expense totals.
+        """
+        source = source.lower()
+        self.add_expense(source,float(loan.monthly_payment()))
+        self.loan_dict[source] = loan
+
+    def remove_loan(self,source:str):
+        """
+        Method to remove a loan and its payment expense
+        """
+        self.remove_expense(source)
+
     def remove_income_source(self,source:str):
         """
         Method to remove an income source
         """
-        del self.income_dict[source.lower()]
+        self._remove_amount("income",source.lower())
 
     def remove_expense(self,source:str):
         """
-        Method to remove an expense
+        Method to remove an expense. Removes the loan too if the expense is a loan payment.
         """
-        del self.expense_dict[source.lower()]
+        self._remove_amount("expense",source.lower())
+        self.loan_dict.pop(source.lower(),None)
 
     def remove_investment(self,source:str):
         """
         Method to remove an investment
         """
-        del self.investment_dict[source.lower()]
+        self._remove_amount("investment",source.lower())
         
     def get_monthly_income(self):
         """
@@ -84,7 +206,7 @@ class Rental():
         if not self.income_dict:
             return 0.
         else:
-            return sum(self.income_dict.values())
+            return self._totals["income"].value()
         
     def get_monthly_expenses(self):
         """
@@ -93,7 +215,7 @@ class Rental():
         if not self.expense_dict:
             return 0.
         else:
-            return sum(self.expense_dict.values())
+            return self._totals["expense"].value()
         
     def get_yearly_income(self):
         """
@@ -113,86 +235,60 @@ class Rental():
         """
         if not self.investment_dict:
             return 0.0
-        return sum(self.investment_dict.values())
+        return self._totals["investment"].value()
         
-    def show_income_sources(self):
+    def _render_table(self,source_dict:dict,amount_header:str,name_header:str,totals:list,end:str="\n",limit:int=None,start:int=0):
         """
-        Method to show all income sources
+        Method to build a table of line items and their totals as a single string. Each amount is
+        formatted once. Only limit line items, starting from line item number start, are listed,
+        with a note of how many were left out. totals is a list of (label, amount) pairs shown under the table.
+        """
+        format_money = lambda x: f"{x:,.2f}"
+        stop = None if limit is None else start + limit
+        shown = [(source,format_money(amount)) for source,amount in itertools.islice(source_dict.items(),start,stop)]
+        # To be used in justifying when printing money. Accounts for the header, which doesn't have '$ '
+        width = max(max((len(amount) for _,amount in shown),default=0),len(amount_header)-2)
+
+        lines = ["",amount_header.rjust(width+2)+" / "+name_header,""]
+        lines.extend("$ "+amount.rjust(width)+" / "+source for source,amount in shown)
+        hidden = len(source_dict) - len(shown)
+        if hidden:
+            lines.append(f"... {hidden:,} more not shown")
+        for label,amount in totals:
+            lines.extend(("",label,"$ "+format_money(amount)))
+        return "\n".join(lines) + end
+
+    def show_income_sources(self,limit:int=None,start:int=0):
+        """
+        Method to show all income sources. Use limit and start to show one page of a long list.
         """
         if not self.income_dict:
             print("There are currently no sources of income")
             return
-        
-        income_header = "Monthly Income" # len = 14
-        
-        format_money = lambda x: f"{x:,.2f}"
-        # To be used in justifying when printing money
-        max_income_len = len(format_money(max(self.income_dict.values())))
-        # Recalculates to account for income header, which doesn't have '$ '
-        max_income_len = max(max_income_len,len(income_header)-2)
+        totals = [("Total Monthly Income",self.get_monthly_income()),("Total Yearly Income",self.get_yearly_income())]
+        sys.stdout.write(self._render_table(self.income_dict,"Monthly Income","Source Name",totals," \n\n",limit,start))
 
-        print()
-        print(income_header.rjust(max_income_len+2),"/","Source Name")
-        print()
-        for source,amount in self.income_dict.items():
-            print("$",format_money(amount).rjust(max_income_len),"/",source)
-        
-        print("\nTotal Monthly Income")
-        print("$",format_money(self.get_monthly_income()))
-        print("\nTotal Yearly Income")
-        print("$",format_money(self.get_yearly_income()),"\n")
-
-    def show_expenses(self):
+    def show_expenses(self,limit:int=None,start:int=0):
         """
-        Method to show all expenses
+        Method to show all expenses. Use limit and start to show one page of a long list.
         """
         if not self.expense_dict:
             print("There are currently no expenses")
             return
-        
-        expense_header = "Monthly Expenses" # len = 16
-        
-        format_money = lambda x: f"{x:,.2f}"
-        # To be used in justifying when printing money
-        max_expense_len = len(format_money(max(self.expense_dict.values())))
-        # Recalculates to account for income header, which doesn't have '$ '
-        max_expense_len = max(max_expense_len,len(expense_header)-2)
-
-        print()
-        print(expense_header.rjust(max_expense_len+2),"/","Expense Name")
-        print()
-        for source,amount in self.expense_dict.items():
-            print("$",format_money(amount).rjust(max_expense_len),"/",source)
-        
-        print("\nTotal Monthly Expense")
-        print("$",format_money(self.get_monthly_expenses()))
-        print("\nTotal Yearly Expense")
-        print("$",format_money(self.get_yearly_expenses()),"\n")
+        totals = [("Total Monthly Expense",self.get_monthly_expenses()),("Total Yearly Expense",self.get_yearly_expenses())]
+        sys.stdout.write(self._render_table(self.expense_dict,"Monthly Expenses","Expense Name",totals," \n\n",limit,start))
 
-    def show_investments(self):
+    def show_investments(self,limit:int=None,start:int=0):
         """
-        Method to show all investments
+        Method to show all investments. Use limit and start to show one page of a long list.
         """
         if not self.investment_dict:
             print("There are currently no investments")
             return
-        
-        investment_header = "Investment Amount" #  len = 17x
-        format_money = lambda x: f"{x:,.2f}"
-        # To be used in justifying when printing money
-        max_investment_len = len(format_money(max(self.investment_dict.values())))
-        # Recalculates to account for income header, which doesn't have '$ '
-        max_investment_len = max(max_investment_len,len(investment_header)-2)
-        print()
-        print(investment_header.rjust(max_investment_len+2),"/","Investment Name")
-        print()
-        for source,amount in self.investment_dict.items():
-            print("$",format_money(amount).rjust(max_investment_len),"/",source)
-        
-        print("\nTotal Investment")
-        print("$",format_money(self.get_total_investment()))
+        totals = [("Total Investment",self.get_total_investment())]
+        sys.stdout.write(self._render_table(self.investment_dict,"Investment Amount","Investment Name",totals,"\n",limit,start))
 
-    def show_sources(self,source_type:str):
+    def show_sources(self,source_type:str,limit:int=None,start:int=0):
         """
         Method to show all incomes, expenses, or investments, based on input. Must be 'income', 'expense', or 'investment'
         """
@@ -201,7 +297,7 @@ class Rental():
             "expense":self.show_expenses,
             "investment":self.show_investments,
         }
-        d[source_type]()
+        d[source_type](limit,start)
         return
 
     def get_monthly_cashflow(self):
@@ -216,86 +312,261 @@ class Rental():
         """
         return self.get_monthly_cashflow() * 12
     
+    def get_yearly_roi(self):
+        """
+        Method to get yearly return on investment as an unrounded percentage. Result is a float.
+        """
+        return self.get_yearly_cashflow() * 100 / self.get_total_investment()
+
     def get_yearly_return_on_investment(self):
         """
         Method to get yearly return on investment as a percentage. Result is a string.
         """
-        ROI = self.get_yearly_cashflow() * 100 / self.get_total_investment()
+        ROI = self.get_yearly_roi()
         return f"{round(ROI,2):.2f}%"
     
+    def sweep(self,first:tuple,second:tuple=None):
+        """
+        Method to get cashflow and ROI for every combination of amounts of one or two line items, without
+        changing the Rental. first and second are (source type, source, amounts to try) tuples, where
+        source type is 'income', 'expense', or 'investment'. Sources the Rental doesn't have are treated as new.
+        Returns a dict of NumPy arrays with one axis per line item: monthly_cashflow, yearly_cashflow, and
+        roi (yearly return on investment as an unrounded percentage).
+        """
+        # NumPy is only needed here, so the interactive program doesn't have to load it
+        import numpy as np
+
+        items = [first] if second is None else [first,second]
+        if second is not None and (first[0],first[1].lower()) == (second[0],second[1].lower()):
+            raise ValueError("Can't sweep the same line item twice")
+        totals = {
+            "income":self.get_monthly_income(),
+            "expense":self.get_monthly_expenses(),
+            "investment":self.get_total_investment(),
+        }
+        for axis,(source_type,source,amounts) in enumerate(items):
+            amounts = np.asarray(amounts,dtype=float)
+            if amounts.ndim != 1:
+                raise ValueError("Amounts to try must be a flat list of amounts")
+            # Only the change from the current amount is needed, added on top of the current totals
+            delta = amounts - self._source_dict(source_type).get(source.lower(),0.)
+            if len(items) == 2 and axis == 0:
+                delta = delta[:,None]
+            totals[source_type] = totals[source_type] + delta
+
+        monthly_cashflow = np.asarray(totals["income"] - totals["expense"])
+        shape = tuple(len(amounts) for _,_,amounts in items)
+        monthly_cashflow = np.broadcast_to(monthly_cashflow,shape)
+        yearly_cashflow = monthly_cashflow * 12
+        with np.errstate(divide="ignore",invalid="ignore"):
+            roi = np.broadcast_to(yearly_cashflow * 100 / totals["investment"],shape)
+        return {
+            "monthly_cashflow":monthly_cashflow,
+            "yearly_cashflow":yearly_cashflow,
+            "roi":roi,
+        }
+
+    def summary_rows(self,property_name:str):
+        """
+        Method to get the rows of the CSV summary written by export_summary, as a list of lists
+        """
+        # Establish reusable lambda
+        format_money = lambda x: f"{x:,.2f}"
+        rows = []
+        rows.append(["Rental Property Name",property_name])
+        rows.append([''])
+
+        # Income Section
+        rows.append(["INCOME"])
+        rows.append(["Monthly Income ($)","Income Name"])
+        rows.extend([format_money(amount),name] for name,amount in self.income_dict.items())
+        rows.append([''])
+        rows.append([format_money(self.get_monthly_income()),"Total Monthly Income"])
+        rows.append([format_money(self.get_yearly_income()),"Total Yearly Income"])
+        rows.append([''])
+        rows.append([''])
+
+        # Expenses Section
+        rows.append(["EXPENSES"])
+        rows.append(["Monthly Expenses ($)","Expense Name"])
+        rows.extend([format_money(amount),name] for name,amount in self.expense_dict.items())
+        rows.append([''])
+        rows.append([format_money(self.get_monthly_expenses()),"Total Monthly Expense"])
+        rows.append([format_money(self.get_yearly_expenses()),"Total Yearly Expense"])
+        rows.append([''])
+        rows.append([''])
+
+        # Cashflow Section
+        rows.append(["CASHFLOW"])
+        rows.append([format_money(self.get_monthly_cashflow()),"Monthly Cashflow"])
+        rows.append([format_money(self.get_yearly_cashflow()),"Yearly Cashflow"])
+        rows.append([''])
+        rows.append([''])
+
+        # Investments Section
+        rows.append(["INVESTMENTS"])
+        rows.append(["Investment Amount ($)","Investment Name"])
+        rows.extend([format_money(amount),name] for name,amount in self.investment_dict.items())
+        rows.append([''])
+        rows.append([format_money(self.get_total_investment()),"Total Investment"])
+        rows.append([''])
+        rows.append([''])
+
+        # ROI Section
+        rows.append(["CASH ON CASH ROI"])
+        rows.append([self.get_yearly_return_on_investment(),"Cash on Cash ROI"])
+        return rows
+
     def export_summary(self,property_name:str):
         """
         Function to create CSV summarizing results of program. Must provide property name
         Property name must only contains letters, spaces, or numbers. Property name will be
         basis of file name.
         """
-        file_name = "_".join(property_name.split())+"_ValueEstimate.csv"
-        with open(file_name,"w") as file:
-            writer = csv.writer(file)
-            # Establish reusable lambda
-            format_money = lambda x: f"{x:,.2f}"
-            writer.writerow(["Rental Property Name",property_name])
-            writer.writerow([''])
-
-            # Income Section
-            writer.writerow(["INCOME"]) 
-            writer.writerow(["Monthly Income ($)","Income Name"])
-            for name,amount in self.income_dict.items():
-                writer.writerow([format_money(amount),name])
-            writer.writerow([''])
-            writer.writerow([format_money(self.get_monthly_income()),"Total Monthly Income"])
-            writer.writerow([format_money(self.get_yearly_income()),"Total Yearly Income"])
-            writer.writerow([''])
-            writer.writerow([''])
-
-            # Expenses Section
-            writer.writerow(["EXPENSES"]) 
-            writer.writerow(["Monthly Expenses ($)","Expense Name"])
-            for name,amount in self.expense_dict.items():
-                writer.writerow([format_money(amount),name])
-            writer.writerow([''])
-            writer.writerow([format_money(self.get_monthly_expenses()),"Total Monthly Expense"])
-            writer.writerow([format_money(self.get_yearly_expenses()),"Total Yearly Expense"])
-            writer.writerow([''])
-            writer.writerow([''])
-
-            # Cashflow Section
-            writer.writerow(["CASHFLOW"])
-            writer.writerow([format_money(self.get_monthly_cashflow()),"Monthly Cashflow"])
-            writer.writerow([format_money(self.get_yearly_cashflow()),"Yearly Cashflow"])
-            writer.writerow([''])
-            writer.writerow([''])
-
-            # Investments Section
-            writer.writerow(["INVESTMENTS"])
-            writer.writerow(["Investment Amount ($)","Investment Name"])
-            for name,amount in self.investment_dict.items():
-                writer.writerow([format_money(amount),name])
-            writer.writerow([''])
-            writer.writerow([format_money(self.get_total_investment()),"Total Investment"])
-            writer.writerow([''])
-            writer.writerow([''])
-
-            # ROI Section
-            writer.writerow(["CASH ON CASH ROI"])
-            writer.writerow([self.get_yearly_return_on_investment(),"Cash on Cash ROI"])
+        rows = self.summary_rows(property_name)
+        with open(summary_file_name(property_name),"w") as file:
+            csv.writer(file).writerows(rows)
     
 
-def rental_property_calculator():
+def summary_file_name(property_name:str):
+    """
+    Function to get the name of the CSV file export_summary writes for a property name
+    """
+    return "_".join(property_name.split())+"_ValueEstimate.csv"
+
+class CentsRental(Rental):
+    """
+    Class to store a rental property with every amount kept as a whole number of cents in compact arrays,
+    instead of a float per line item. Totals are exact integer sums, so large portfolios reconcile to the cent.
+    Amounts are rounded to the nearest cent when they are added. income_dict, expense_dict, and investment_dict
+    are read-only mappings built from the arrays each time they are asked for; change amounts with the add,
+    update, and remove methods. Source names are interned, so a name like "rent" is stored once for every property.
+    Finding a source scans its list of names, which is fast for the dozens of line items a property usually has.
+    """
+    def __init__(self) -> None:
+        # Everything is kept in tuples and lists indexed by _type_codes, which take less room than dicts.
+        # Source names in the order they were added, and the cents of each at the same position
+        self._names = ([],[],[])
+        self._cents = (array("q"),array("q"),array("q"))
+        self._total_cents = [0,0,0]
+        self.loan_dict = dict()
+        self._fingerprint = None
+
+    _type_codes = {"income":0,"expense":1,"investment":2}
+
+    def _view(self,type_code:int):
+        """
+        Method to get a read-only mapping of source name to dollar amount for a type code
+        """
+        return MappingProxyType({source:cents / 100 for source,cents in zip(self._names[type_code],self._cents[type_code])})
+
+    income_dict = property(lambda self: self._view(0))
+    expense_dict = property(lambda self: self._view(1))
+    investment_dict = property(lambda self: self._view(2))
+
+    def _set_amount(self,source_type:str,source:str,amount:float):
+        """
+        Method to set the amount of a source, rounded to the nearest cent.
+        Returns the previous amount, or None if the source is new.
+        """
+        type_code = self._type_codes[source_type]
+        cents = round(amount * 100)
+        names = self._names[type_code]
+        cents_array = self._cents[type_code]
+        self._fingerprint = None
+        try:
+            position = names.index(source)
+        except ValueError:
+            names.append(sys.intern(source))
+            cents_array.append(cents)
+            self._total_cents[type_code] += cents
+            return None
+        previous = cents_array[position]
+        cents_array[position] = cents
+        self._total_cents[type_code] += cents - previous
+        return previous / 100
+
+    def _remove_amount(self,source_type:str,source:str):
+        """
+        Method to remove a source
+        """
+        type_code = self._type_codes[source_type]
+        names = self._names[type_code]
+        try:
+            position = names.index(source)
+        except ValueError:
+            raise KeyError(source) from None
+        del names[position]
+        self._total_cents[type_code] -= self._cents[type_code].pop(position)
+        self._fingerprint = None
+
+    def get_total_cents(self,source_type:str):
+        """
+        Method to get the exact total of 'income', 'expense', or 'investment' as a whole number of cents
+        """
+        return self._total_cents[self._type_codes[source_type]]
+
+    def get_monthly_income(self):
+        """
+        Method to get monthly income
+        """
+        return self._total_cents[0] / 100
+
+    def get_monthly_expenses(self):
+        """
+        Method to get monthly expenses
+        """
+        return self._total_cents[1] / 100
+
+    def get_total_investment(self):
+        """
+        Method to get total investments
+        """
+        return self._total_cents[2] / 100
+
+# Hook for rental_profiling. When set, it is called with (name, function) for each of the calculator's
+# helper functions and returns the function the calculator uses instead
+helper_wrapper = None
+
+def rental_property_calculator(script=None,typing_effects:bool=True):
     """
     Interactive rental property eveluator program
+    Answers are read with input() unless a script is given. A script can be a file name, an open
+    file or stream, or a list of answers, with one answer per prompt in the order they are asked.
+    Set typing_effects to False to skip the typing effect and every delay. Returns the Rental.
     """
+    def pause(seconds:float):
+        """
+        Sleep for the given number of seconds, unless typing effects are turned off
+        """
+        if typing_effects:
+            sleep(seconds)
+
+    def read_response():
+        """
+        Get the next answer from the script, or from the user if there is no script
+        """
+        if answers is None:
+            return input()
+        try:
+            return next(answers).rstrip("\n")
+        except StopIteration:
+            raise EOFError("The script ran out of answers before the program finished") from None
+
     def p(text=""):
         """
         Make texted printed to console look like it is being typed
         The function below was created using knowledge gained from link below
         https://stackoverflow.com/questions/9246076/how-to-print-one-character-at-a-time-on-one-line
         """
+        if not typing_effects:
+            print(text)
+            return
         for char in text:
             sys.stdout.write(char)
             sys.stdout.flush()
-            sleep(0.01)
-        sleep(0.4)
+            pause(0.01)
+        pause(0.4)
         print()
         return
 
@@ -308,7 +579,7 @@ def rental_property_calculator():
 
         while True:
             p(prompt)
-            response = input().strip()
+            response = read_response().strip()
             
             try:
                 response = float(response)
@@ -333,7 +604,7 @@ def rental_property_calculator():
         """
         while True:
             p(prompt)
-            response = input().strip().lower()
+            response = read_response().strip().lower()
             if response == "y" or response == "n":
                 if y_n_as_bool:
                     return response == "y" 
@@ -389,7 +660,7 @@ def rental_property_calculator():
 
         while True:
             p(prompt)
-            source = input().strip().lower()
+            source = read_response().strip().lower()
             if not source:
                 p("Response can not be empty. Please try again")
                 continue
@@ -445,9 +716,9 @@ def rental_property_calculator():
         elif source_type == "investment":
             rental.add_investment(source,money)
 
-        sleep(delay_time)
+        pause(delay_time)
         rental.show_sources(source_type)
-        sleep(delay_time)
+        pause(delay_time)
             
     def update_source(source_type:str):
         """
@@ -494,9 +765,9 @@ def rental_property_calculator():
         elif source_type == "investment":
             rental.update_investment(source,money)
         
-        sleep(delay_time)
+        pause(delay_time)
         rental.show_sources(source_type)
-        sleep(delay_time)
+        pause(delay_time)
 
     def remove_source(source_type:str):
         """
@@ -537,9 +808,9 @@ def rental_property_calculator():
         elif source_type == "investment":
             rental.remove_investment(source)
         
-        sleep(delay_time)
+        pause(delay_time)
         rental.show_sources(source_type)
-        sleep(delay_time)
+        pause(delay_time)
 
     
     def print_modify_source_commands(source_type):
@@ -553,7 +824,7 @@ def rental_property_calculator():
         }
         source_text = source_types[source_type]
         p(f"Here are your commands to modify an {source_text}...")
-        sleep(delay_time)
+        pause(delay_time)
 
         print("'add'")
         print(f"Will prompt you to add a {source_text}\n")
@@ -575,7 +846,7 @@ def rental_property_calculator():
         
         while True:
             p("What would you like to do?: ")
-            command = input().strip().lower()
+            command = read_response().strip().lower()
             if command == "add":
                 add_source(source_type)
             elif command == "update":
@@ -612,9 +883,9 @@ def rental_property_calculator():
 
         p("Here is a summary of your current income")
     
-        sleep(delay_time)
+        pause(delay_time)
         rental.show_income_sources()
-        sleep(delay_time)
+        pause(delay_time)
 
         p("The options I gave you are just some of the examples of different income sources")
         p("Now is your chance to customize")
@@ -656,9 +927,9 @@ def rental_property_calculator():
 
         p("Here is a summary of your current expenses")
     
-        sleep(delay_time)
+        pause(delay_time)
         rental.show_expenses()
-        sleep(delay_time)
+        pause(delay_time)
 
         p("The options I gave you are just some of the examples of different types of expenses")
         p("Now is your chance to customize")
@@ -705,9 +976,9 @@ def rental_property_calculator():
 
         p("Here is a summary of your current investments")
     
-        sleep(delay_time)
+        pause(delay_time)
         rental.show_investments()
-        sleep(delay_time)
+        pause(delay_time)
         
         p("The options I gave you are just some of the examples of different types of investment costs")
 
@@ -740,15 +1011,15 @@ def rental_property_calculator():
         summary_sleep_duration = 3
         
         p("Here is the final report")
-        sleep(1)
+        pause(1)
         
         print("\n\nINCOME")
         rental.show_income_sources()
-        sleep(summary_sleep_duration)
+        pause(summary_sleep_duration)
         
         print("\n\nEXPENSES")
         rental.show_expenses()
-        sleep(summary_sleep_duration)
+        pause(summary_sleep_duration)
         
         print("\n\nCASHFLOW\n")
         print("Monthly cash flow...")
@@ -757,12 +1028,12 @@ def rental_property_calculator():
         print("Yearly cash flow...")
         print("$ "+format_money(rental.get_yearly_cashflow()))
         print()
-        sleep(summary_sleep_duration)
+        pause(summary_sleep_duration)
 
         print("\n\nINVESTMENTS")
         rental.show_investments()
         print()
-        sleep(summary_sleep_duration)
+        pause(summary_sleep_duration)
 
         p("With this this information, we can calculate your Cash on Cash return on investment (ROI)")
         p("Your cash on cash ROI is....")
@@ -779,18 +1050,45 @@ def rental_property_calculator():
             p("Be warned, this may overwrite any summaries previously created with the same property name.")
             p("Also, please only use letters, spaces, and numbers in property name")
             p("What would you like to name this property?: ")
-            property_name = input().strip()
+            property_name = read_response().strip()
             rental.export_summary(property_name)
             p("Your summary file has been created")
 
         p("Thank you for using this program!!!")
 
+    # Iterator over scripted answers, or None to ask the user
+    if script is None:
+        answers = None
+    elif isinstance(script,str):
+        with open(script) as file:
+            answers = iter(file.readlines())
+    else:
+        answers = iter(script)
+
     # Created the Rental Object
     rental = Rental()
     # Constant to manipulate delay time in displaying certain information
     delay_time = 1
     # Resuable lambda to quickly format a number
     format_money = lambda x: f"{x:,.2f}"    
+
+    if helper_wrapper is not None:
+        # The helpers call each other through these names, so every call goes through the wrapped versions
+        p = helper_wrapper("p",p)
+        format_money = helper_wrapper("format_money",format_money)
+        get_valid_money = helper_wrapper("get_valid_money",get_valid_money)
+        get_y_or_n = helper_wrapper("get_y_or_n",get_y_or_n)
+        get_valid_source = helper_wrapper("get_valid_source",get_valid_source)
+        add_source = helper_wrapper("add_source",add_source)
+        update_source = helper_wrapper("update_source",update_source)
+        remove_source = helper_wrapper("remove_source",remove_source)
+        modify_source = helper_wrapper("modify_source",modify_source)
+        welcome = helper_wrapper("welcome",welcome)
+        income = helper_wrapper("income",income)
+        expenses = helper_wrapper("expenses",expenses)
+        cash_flow = helper_wrapper("cash_flow",cash_flow)
+        investments = helper_wrapper("investments",investments)
+        summary = helper_wrapper("summary",summary)
     
     welcome()
     income()
@@ -800,5 +1098,16 @@ def rental_property_calculator():
     summary()
     return rental
 
+def run_headless(script):
+    """
+    Function to run the rental property calculator from a script without typing effects or delays.
+    Script is the same as for rental_property_calculator. Returns the Rental and the text report that
+    would have been printed to the console.
+    """
+    report = io.StringIO()
+    with contextlib.redirect_stdout(report):
+        rental = rental_property_calculator(script,typing_effects=False)
+    return rental, report.getvalue()
+
 if __name__ == "__main__":
     rental_property_calculator()
\ No newline at end of file
@@ -0,0 +1,113 @@
+import numpy as np
+
+from rental_portfolio import as_portfolio
+
+class PortfolioQuery():
+    """
+    Class to rank and filter many properties by ROI and cashflow. Everything a query needs is
+    worked out once when the query is created: the values, their sorted order, and which properties
+    have each expense. Queries return arrays of rows, which can be combined with narrow() and turned
+    into property ids with ids().
+    Rentals can be a RentalPortfolio, a dict of property id to Rental, or (property id, Rental) pairs.
+    Build a new PortfolioQuery after the rentals change.
+    """
+    def __init__(self,rentals) -> None:
+        portfolio = as_portfolio(rentals)
+        self.property_ids = list(portfolio.property_ids)
+        self.values = {
+            "roi":portfolio.get_yearly_roi(),
+            "yearly_cashflow":portfolio.get_yearly_cashflow(),
+            "monthly_cashflow":portfolio.get_monthly_cashflow(),
+            "total_investment":portfolio.get_total_investment(),
+        }
+        # Sorted order of each value, for range filters. Properties without a finite value
+        # (ROI with no investment) are left out, so they never show up in rankings or ranges.
+        self._sorted = dict()
+        for name,values in self.values.items():
+            rows = np.flatnonzero(np.isfinite(values))
+            rows = rows[np.argsort(values[rows],kind="stable")]
+            self._sorted[name] = (rows,values[rows])
+
+        # Rows with each expense, by source name
+        rows,type_codes,source_ids,_ = portfolio.columns()
+        expenses = type_codes == 1
+        expense_rows,expense_sources = rows[expenses],source_ids[expenses]
+        order = np.lexsort((expense_rows,expense_sources))
+        expense_rows,expense_sources = expense_rows[order],expense_sources[order]
+        boundaries = np.flatnonzero(np.diff(expense_sources)) + 1
+        self._expense_rows = {
+            portfolio.source_names[group_sources[0]]:group_rows
+            for group_rows,group_sources in zip(np.split(expense_rows,boundaries),np.split(expense_sources,boundaries))
+            if len(group_rows)
+        }
+
+    def __len__(self):
+        return len(self.property_ids)
+
+    def _values(self,by:str):
+        """
+        Method to get the values to rank or filter by
+        """
+        if by not in self.values:
+            raise ValueError(f"by must be one of {', '.join(self.values)}, not {by!r}")
+        return self.values[by]
+
+    def ids(self,rows):
+        """
+        Method to turn rows into property ids
+        """
+        return [self.property_ids[row] for row in rows]
+
+    def top(self,n:int,by:str="roi",rows=None,largest:bool=True):
+        """
+        Method to get the n best rows by 'roi', 'yearly_cashflow', 'monthly_cashflow', or 'total_investment',
+        best first. Set largest to False for the smallest values. rows limits the ranking to the result of
+        other queries. Uses a partial selection, so only the n winners are sorted.
+        """
+        values = self._values(by)
+        if rows is None:
+            rows = self._sorted[by][0]
+        else:
+            rows = np.asarray(rows)
+            rows = rows[np.isfinite(values[rows])]
+        if n <= 0:
+            return rows[:0]
+        keys = -values[rows] if largest else values[rows]
+        if n < len(rows):
+            rows = rows[np.argpartition(keys,n - 1)[:n]]
+            keys = -values[rows] if largest else values[rows]
+        return rows[np.argsort(keys,kind="stable")]
+
+    def between(self,by:str,low:float=None,high:float=None):
+        """
+        Method to get the rows with low <= value <= high, in row order. Leave low or high out for an open range.
+        Found by binary search on the sorted values, not by scanning every property.
+        """
+        self._values(by)
+        rows,sorted_values = self._sorted[by]
+        start = 0 if low is None else np.searchsorted(sorted_values,low,side="left")
+        stop = len(sorted_values) if high is None else np.searchsorted(sorted_values,high,side="right")
+        return np.sort(rows[start:stop])
+
+    def with_expense(self,source:str):
+        """
+        Method to get the rows of properties that have an expense, in row order
+        """
+        return self._expense_rows.get(source.lower(),np.zeros(0,dtype=np.int64))
+
+    def without_expense(self,source:str):
+        """
+        Method to get the rows of properties that don't have an expense, in row order
+        """
+        mask = np.ones(len(self),dtype=bool)
+        mask[self.with_expense(source)] = False
+        return np.flatnonzero(mask)
+
+    def narrow(self,*row_sets):
+        """
+        Method to get the rows found in every one of the given results, in row order
+        """
+        rows = row_sets[0]
+        for other in row_sets[1:]:
+            rows = np.intersect1d(rows,other,assume_unique=True)
+        return rows
@@ -0,0 +1,158 @@
+import numpy as np
+
+from rental_portfolio import RentalPortfolio, as_portfolio
+
+class CategoryIndex():
+    """
+    Class to roll up line items of many properties by category and by property tag.
+    categories maps source names to category names, like {"home insurance":"insurance", "flood insurance":"insurance"}.
+    A source that isn't in categories is its own category. Every category gets an integer id, and the amount of
+    each property in each category is summed once when the index is created, grouped by source type and category,
+    so a rollup reads one slice of the index instead of every line item.
+    Rentals can be a RentalPortfolio, a dict of property id to Rental, or (property id, Rental) pairs.
+    Build a new CategoryIndex after the rentals change.
+    """
+    def __init__(self,rentals,categories:dict=None) -> None:
+        portfolio = as_portfolio(rentals)
+        self.property_ids = list(portfolio.property_ids)
+        n = len(self.property_ids)
+
+        categories = {source.lower():category for source,category in (categories or dict()).items()}
+        self.category_names = []
+        self._category_ids = dict()
+        source_categories = np.array([
+            self._category_id(categories.get(source,source)) for source in portfolio.source_names
+        ],dtype=np.int64)
+        n_categories = len(self.category_names)
+
+        # Key of a line item is (type code * number of categories + category id) * n + row, so sorting the keys
+        # groups the items by source type and category, and by row within each group
+        rows,type_codes,source_ids,amounts = portfolio.columns()
+        keys = (type_codes.astype(np.int64) * n_categories + source_categories[source_ids]) * n + rows
+        keys,inverse = np.unique(keys,return_inverse=True)
+        self._rows = keys % n
+        self._amounts = np.bincount(inverse,weights=amounts,minlength=len(keys))
+        self._offsets = np.searchsorted(keys // max(n,1),np.arange(3 * n_categories + 1))
+        self._tags = dict()
+
+    def __len__(self):
+        return len(self.property_ids)
+
+    def _category_id(self,category:str):
+        """
+        Method to get the id of a category, adding it if needed
+        """
+        category = category.lower()
+        category_id = self._category_ids.get(category)
+        if category_id is None:
+            category_id = self._category_ids[category] = len(self.category_names)
+            self.category_names.append(category)
+        return category_id
+
+    def get_category_id(self,category:str):
+        """
+        Method to get the id of a category, or None if no source is in it
+        """
+        return self._category_ids.get(category.lower())
+
+    def _slice(self,source_type:str,category_id:int):
+        """
+        Method to get the rows and amounts of the properties with any line item of a type in a category
+        """
+        group = RentalPortfolio.source_types.index(source_type) * len(self.category_names) + category_id
+        start,stop = self._offsets[group],self._offsets[group + 1]
+        return self._rows[start:stop],self._amounts[start:stop]
+
+    def values(self,source_type:str,category:str):
+        """
+        Method to get the amount of 'income', 'expense', or 'investment' in a category for every property,
+        0 where a property has none. Divide the results of two calls for shares, like tax as a share of rent.
+        """
+        if source_type not in RentalPortfolio.source_types:
+            raise ValueError(f"source_type must be 'income', 'expense', or 'investment', not {source_type!r}")
+        values = np.zeros(len(self))
+        category_id = self.get_category_id(category)
+        if category_id is not None:
+            rows,amounts = self._slice(source_type,category_id)
+            values[rows] = amounts
+        return values
+
+    def share(self,numerator:tuple,denominator:tuple):
+        """
+        Method to get one category as a share of another for every property, like share(("expense","tax"),("income","rent")).
+        numerator and denominator are (source type, category) pairs. Properties with none of the denominator get inf
+        or nan, which rollup leaves out.
+        """
+        with np.errstate(divide="ignore",invalid="ignore"):
+            return self.values(*numerator) / self.values(*denominator)
+
+    def totals(self,source_type:str):
+        """
+        Method to get the portfolio total of every category of 'income', 'expense', or 'investment',
+        as a dict of category name to total. Categories no property has are left out.
+        """
+        if source_type not in RentalPortfolio.source_types:
+            raise ValueError(f"source_type must be 'income', 'expense', or 'investment', not {source_type!r}")
+        totals = dict()
+        for category_id,category in enumerate(self.category_names):
+            rows,amounts = self._slice(source_type,category_id)
+            if len(rows):
+                totals[category] = amounts.sum()
+        return totals
+
+    def add_tag(self,name:str,tags:dict):
+        """
+        Method to tag properties, like add_tag("market",{"main st":"Austin", ...}), so rollups can be grouped by it.
+        Properties without a tag are left out of rollups grouped by name.
+        """
+        tag_values = []
+        tag_ids = dict()
+        codes = np.full(len(self),-1,dtype=np.int64)
+        for row,property_id in enumerate(self.property_ids):
+            if property_id not in tags:
+                continue
+            value = tags[property_id]
+            code = tag_ids.get(value)
+            if code is None:
+                code = tag_ids[value] = len(tag_values)
+                tag_values.append(value)
+            codes[row] = code
+        self._tags[name] = (tag_values,codes)
+
+    def rollup(self,values,by:str=None,stat:str="sum",q:float=50):
+        """
+        Method to aggregate one value per property (from values(), or any array with one entry per property)
+        with stat 'sum', 'mean', 'count', or 'percentile' (the q-th). inf and nan values are left out, so a share
+        with a zero denominator doesn't count. Returns a number, or a dict of tag value to number when grouped
+        by a tag added with add_tag.
+        """
+        if stat not in ("sum","mean","count","percentile"):
+            raise ValueError(f"stat must be 'sum', 'mean', 'count', or 'percentile', not {stat!r}")
+        values = np.asarray(values,dtype=float)
+        if by is None:
+            values = values[np.isfinite(values)]
+            if stat == "sum":
+                return values.sum()
+            if stat == "count":
+                return len(values)
+            if not len(values):
+                return np.nan
+            return values.mean() if stat == "mean" else np.percentile(values,q)
+
+        tag_values,codes = self._tags[by]
+        keep = (codes >= 0) & np.isfinite(values)
+        codes,values = codes[keep],values[keep]
+        counts = np.bincount(codes,minlength=len(tag_values))
+        if stat == "sum":
+            results = np.bincount(codes,weights=values,minlength=len(tag_values))
+        elif stat == "count":
+            results = counts
+        elif stat == "mean":
+            with np.errstate(divide="ignore",invalid="ignore"):
+                results = np.bincount(codes,weights=values,minlength=len(tag_values)) / counts
+        else:
+            # Sort by tag, then by value, so each tag's values are one sorted run
+            order = np.lexsort((values,codes))
+            runs = np.split(values[order],np.cumsum(counts)[:-1])
+            results = [np.percentile(run,q) if len(run) else np.nan for run in runs]
+        return dict(zip(tag_values,results))
@@ -0,0 +1,131 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import os
+
+import numpy as np
+
+from rental_export import export_summaries, render_summaries
+from rental_portfolio import as_portfolio, compensated_bincount
+from rental_property_program import Rental
+
+# Columns shared with the workers, in the order they are laid out in the shared memory block
+_COLUMNS = (("offsets","<i8"),("amounts","<f8"),("source_ids","<i4"),("type_codes","i1"))
+
+# Set in each worker by _init_worker
+_worker = dict()
+
+def _init_worker(memory_name:str,layout:dict,source_names:list,property_names:list):
+    """
+    Function to attach a worker process to the shared line items. Runs once per worker, so the
+    source name table and property names are only sent to each worker once.
+    """
+    # Workers share the parent's resource tracker, so attaching doesn't take ownership of the block
+    memory = shared_memory.SharedMemory(name=memory_name)
+    _worker["memory"] = memory
+    _worker["columns"] = {
+        name:np.ndarray((count,),dtype=dtype,buffer=memory.buf,offset=offset)
+        for name,(dtype,offset,count) in layout.items()
+    }
+    _worker["source_names"] = source_names
+    _worker["property_names"] = property_names
+
+def _shard_rentals(start:int,stop:int):
+    """
+    Function to rebuild the Rentals of rows start to stop from the shared line items, as (property name, Rental) pairs
+    """
+    columns = _worker["columns"]
+    offsets,amounts,source_ids,type_codes = (columns[name] for name,_ in _COLUMNS)
+    names = _worker["source_names"]
+    for row in range(start,stop):
+        rental = Rental()
+        for item in range(offsets[row],offsets[row + 1]):
+            rental.set_source(("income","expense","investment")[type_codes[item]],names[source_ids[item]],float(amounts[item]))
+        yield _worker["property_names"][row], rental
+
+def _evaluate_shard(start:int,stop:int,export_directory:str,layout:str):
+    """
+    Function to evaluate the properties in rows start to stop. Returns an (n, 3) array of monthly income,
+    monthly expenses, and total investment, and the rendered summaries if the layout is 'single'.
+    """
+    columns = _worker["columns"]
+    offsets = columns["offsets"]
+    first,last = offsets[start],offsets[stop]
+    rows = np.repeat(np.arange(stop - start),np.diff(offsets[start:stop + 1]))
+    bins = rows * 3 + columns["type_codes"][first:last]
+    totals = compensated_bincount(bins,columns["amounts"][first:last],3 * (stop - start)).reshape(-1,3)
+
+    text = None
+    if export_directory is not None:
+        if layout == "single":
+            text = render_summaries(_shard_rentals(start,stop))
+        else:
+            export_summaries(_shard_rentals(start,stop),export_directory)
+    return totals, text
+
+class ShardedResult():
+    """
+    Class to hold the results of evaluate_sharded, in the same order as the properties that went in
+    """
+    def __init__(self,property_ids:list,totals) -> None:
+        self.property_ids = property_ids
+        self.monthly_income = totals[:,0]
+        self.monthly_expenses = totals[:,1]
+        self.total_investment = totals[:,2]
+        self.monthly_cashflow = self.monthly_income - self.monthly_expenses
+        self.yearly_cashflow = self.monthly_cashflow * 12
+        with np.errstate(divide="ignore",invalid="ignore"):
+            self.roi = self.yearly_cashflow * 100 / self.total_investment
+
+def evaluate_sharded(rentals,workers:int=None,shards:int=None,export_directory:str=None,layout:str="files",
+                     file_name:str="Portfolio_ValueEstimate.csv"):
+    """
+    Function to work out cashflow and ROI of many properties, and optionally export their summaries,
+    using a pool of worker processes. rentals can be a RentalPortfolio, a dict of property name to Rental,
+    or (property name, Rental) pairs. The line items are copied once into shared memory, which every
+    worker reads directly, instead of pickling Rentals to each worker. The properties are split into
+    shards (4 per worker by default) and the results are put back together in property order.
+    Summaries are written like export_summaries, to export_directory, with layout 'files' or 'single'.
+    workers defaults to the number of CPUs. Returns a ShardedResult.
+    """
+    if layout not in ("files","single"):
+        raise ValueError(f"layout must be 'files' or 'single', not {layout!r}")
+    portfolio = as_portfolio(rentals)
+    n = len(portfolio)
+    workers = workers or os.cpu_count() or 1
+    shards = max(min(shards or workers * 4,n),1)
+
+    rows,type_codes,source_ids,amounts = portfolio.columns()
+    # A stable sort groups line items by property and keeps them in the order they were added
+    order = np.argsort(rows,kind="stable")
+    offsets = np.zeros(n + 1,dtype=np.int64)
+    np.cumsum(np.bincount(rows,minlength=n),out=offsets[1:])
+    data = {"offsets":offsets,"amounts":amounts[order],"source_ids":source_ids[order],"type_codes":type_codes[order]}
+
+    layout_info = dict()
+    size = 0
+    for name,dtype in _COLUMNS:
+        count = len(data[name])
+        layout_info[name] = (dtype,size,count)
+        size += -(-count * np.dtype(dtype).itemsize // 8) * 8
+    memory = shared_memory.SharedMemory(create=True,size=max(size,1))
+    try:
+        for name,(dtype,offset,count) in layout_info.items():
+            np.ndarray((count,),dtype=dtype,buffer=memory.buf,offset=offset)[:] = data[name]
+        del data
+
+        property_names = [str(property_id) for property_id in portfolio.property_ids] if export_directory is not None else None
+        bounds = np.linspace(0,n,shards + 1).astype(int)
+        starts,stops = bounds[:-1].tolist(),bounds[1:].tolist()
+        with ProcessPoolExecutor(workers,initializer=_init_worker,
+                                 initargs=(memory.name,layout_info,portfolio.source_names,property_names)) as pool:
+            results = list(pool.map(_evaluate_shard,starts,stops,[export_directory] * shards,[layout] * shards))
+    finally:
+        memory.close()
+        memory.unlink()
+
+    if export_directory is not None and layout == "single":
+        with open(os.path.join(export_directory,file_name),"w") as file:
+            for _,text in results:
+                file.write(text)
+    totals = np.concatenate([shard_totals for shard_totals,_ in results]) if results else np.zeros((0,3))
+    return ShardedResult(list(portfolio.property_ids),totals)
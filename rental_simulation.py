@@ -0,0 +1,175 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+class Normal():
+    """
+    Class for a normally distributed amount
+    """
+    def __init__(self,mean:float,std:float) -> None:
+        self.mean = mean
+        self.std = std
+
+    def sample(self,rng,size:int):
+        """
+        Method to draw size amounts with a NumPy random generator
+        """
+        return rng.normal(self.mean,self.std,size)
+
+class LogNormal():
+    """
+    Class for a lognormally distributed amount, like repairs: usually small with the odd large bill.
+    mean is the average amount and sigma is the standard deviation of its logarithm.
+    """
+    def __init__(self,mean:float,sigma:float) -> None:
+        self.mean = mean
+        self.sigma = sigma
+
+    def sample(self,rng,size:int):
+        """
+        Method to draw size amounts with a NumPy random generator
+        """
+        mu = np.log(self.mean) - self.sigma ** 2 / 2
+        return rng.lognormal(mu,self.sigma,size)
+
+class Uniform():
+    """
+    Class for an amount equally likely to be anywhere between low and high
+    """
+    def __init__(self,low:float,high:float) -> None:
+        self.low = low
+        self.high = high
+
+    def sample(self,rng,size:int):
+        """
+        Method to draw size amounts with a NumPy random generator
+        """
+        return rng.uniform(self.low,self.high,size)
+
+class PercentOf():
+    """
+    Class for an expense or investment that is a share of an income source, like vacancy as a percentage of rent.
+    rate is a fraction (0.05 for 5%), either a number or one of the distributions above.
+    The income source is drawn first, so the amount follows it in every scenario.
+    """
+    def __init__(self,source:str,rate) -> None:
+        self.source = source.lower()
+        self.rate = rate
+
+    def sample(self,rng,size:int,income_draws:dict):
+        """
+        Method to draw size amounts, given the draws of each income source
+        """
+        if self.source not in income_draws:
+            raise KeyError(f"PercentOf refers to income source {self.source!r}, which is not in the simulation")
+        rate = self.rate.sample(rng,size) if hasattr(self.rate,"sample") else self.rate
+        return rate * income_draws[self.source]
+
+def _draw(rng,size:int,amount,income_draws:dict=None):
+    """
+    Function to draw size values of a line item, which is either a fixed amount or a distribution
+    """
+    if isinstance(amount,PercentOf):
+        return amount.sample(rng,size,income_draws)
+    if hasattr(amount,"sample"):
+        return amount.sample(rng,size)
+    return np.full(size,float(amount))
+
+def _simulate_chunk(line_items,seed_sequence,size:int):
+    """
+    Function to simulate one chunk of scenarios. Returns arrays of yearly cashflow and yearly ROI.
+    """
+    rng = np.random.default_rng(seed_sequence)
+    income_items,expense_items,investment_items = line_items
+    income_draws = dict()
+    monthly_income = np.zeros(size)
+    for source,amount in income_items:
+        income_draws[source] = _draw(rng,size,amount)
+        monthly_income += income_draws[source]
+    monthly_expenses = np.zeros(size)
+    for source,amount in expense_items:
+        monthly_expenses += _draw(rng,size,amount,income_draws)
+    investment = np.zeros(size)
+    for source,amount in investment_items:
+        investment += _draw(rng,size,amount,income_draws)
+    yearly_cashflow = (monthly_income - monthly_expenses) * 12
+    with np.errstate(divide="ignore",invalid="ignore"):
+        roi = yearly_cashflow * 100 / investment
+    return yearly_cashflow, roi
+
+class SimulationResult():
+    """
+    Class to hold the simulated yearly cashflow and yearly return on investment (as a percentage) of every scenario
+    """
+    def __init__(self,yearly_cashflow,roi) -> None:
+        self.yearly_cashflow = yearly_cashflow
+        self.roi = roi
+
+    def percentiles(self,q=(5,25,50,75,95)):
+        """
+        Method to get the percentiles of yearly cashflow and ROI. Returns a dict of name to array, in the order of q.
+        """
+        return {
+            "yearly_cashflow":np.percentile(self.yearly_cashflow,q),
+            "roi":np.percentile(self.roi,q),
+        }
+
+class RentalSimulation():
+    """
+    Class to run a Monte Carlo simulation of a Rental. Line items keep the Rental's amount unless a
+    distribution is attached to them with set_distribution.
+    """
+    def __init__(self,rental) -> None:
+        self.rental = rental
+        self.distributions = dict()
+
+    def set_distribution(self,source_type:str,source:str,distribution):
+        """
+        Method to attach a distribution to an 'income', 'expense', or 'investment' source.
+        The source is added to the simulation if the Rental doesn't have it, like vacancy.
+        """
+        if source_type not in ("income","expense","investment"):
+            raise ValueError(f"source_type must be 'income', 'expense', or 'investment', not {source_type!r}")
+        if isinstance(distribution,PercentOf) and source_type == "income":
+            raise ValueError("PercentOf can only be used for expenses and investments")
+        self.distributions[(source_type,source.lower())] = distribution
+
+    def remove_distribution(self,source_type:str,source:str):
+        """
+        Method to go back to the Rental's fixed amount for a source
+        """
+        del self.distributions[(source_type,source.lower())]
+
+    def _line_items(self):
+        """
+        Method to get the (source, amount or distribution) pairs of income, expenses, and investments
+        """
+        line_items = []
+        for source_type,source_dict in (("income",self.rental.income_dict),("expense",self.rental.expense_dict),("investment",self.rental.investment_dict)):
+            items = {source:self.distributions.get((source_type,source),amount) for source,amount in source_dict.items()}
+            for (distribution_type,source),distribution in self.distributions.items():
+                if distribution_type == source_type:
+                    items[source] = distribution
+            line_items.append(list(items.items()))
+        return tuple(line_items)
+
+    def run(self,n:int,seed=None,chunk_size:int=250_000,workers:int=None):
+        """
+        Method to simulate n scenarios. Each chunk of chunk_size scenarios gets its own random stream
+        spawned from seed, so a seed gives the same results whatever the number of workers.
+        Set workers to spread the chunks over a pool of that many processes. Returns a SimulationResult.
+        """
+        line_items = self._line_items()
+        sizes = [min(chunk_size,n - start) for start in range(0,n,chunk_size)]
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        if workers:
+            with ProcessPoolExecutor(workers) as pool:
+                chunks = list(pool.map(_simulate_chunk,[line_items] * len(sizes),seeds,sizes))
+        else:
+            chunks = [_simulate_chunk(line_items,chunk_seed,size) for chunk_seed,size in zip(seeds,sizes)]
+        if not chunks:
+            return SimulationResult(np.zeros(0),np.zeros(0))
+        return SimulationResult(
+            np.concatenate([cashflow for cashflow,_ in chunks]),
+            np.concatenate([roi for _,roi in chunks]),
+        )
@@ -0,0 +1,258 @@
+import sqlite3
+
+from rental_property_program import Rental
+
+source_types = ("income","expense","investment")
+
+# Line items are stored once per (property, kind, source), with kind 0 income, 1 expense, 2 investment.
+# Property ids and source names are stored once each and referenced by integer id. The rowid of a line
+# item keeps the order items were added in, which is the order of the Rental's dicts.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS properties (
+    id INTEGER PRIMARY KEY,
+    property_id TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS sources (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS line_items (
+    id INTEGER PRIMARY KEY,
+    property INTEGER NOT NULL REFERENCES properties(id) ON DELETE CASCADE,
+    kind INTEGER NOT NULL CHECK (kind IN (0, 1, 2)),
+    source INTEGER NOT NULL REFERENCES sources(id),
+    amount REAL NOT NULL,
+    UNIQUE (property, kind, source)
+);
+"""
+
+_SOURCE_INDEX = "CREATE INDEX IF NOT EXISTS line_items_source ON line_items (source, kind)"
+
+# Rows waiting to be upserted. A temporary table only this connection can see, with no indexes so filling it is cheap.
+_STAGING = """
+CREATE TEMP TABLE IF NOT EXISTS staging (
+    property_id TEXT NOT NULL,
+    kind INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    amount REAL NOT NULL
+);
+"""
+
+# Every statement that reads from staging ends in WHERE true, which SQLite needs before ON CONFLICT in INSERT ... SELECT
+_UPSERT_STAGING = (
+    "INSERT INTO properties (property_id) SELECT DISTINCT property_id FROM staging WHERE true ON CONFLICT DO NOTHING",
+    "INSERT INTO sources (name) SELECT DISTINCT source FROM staging WHERE true ON CONFLICT DO NOTHING",
+    """INSERT INTO line_items (property, kind, source, amount)
+       SELECT properties.id, staging.kind, sources.id, staging.amount
+       FROM staging
+       JOIN properties ON properties.property_id = staging.property_id
+       JOIN sources ON sources.name = staging.source
+       WHERE true
+       ORDER BY staging.rowid
+       ON CONFLICT (property, kind, source) DO UPDATE SET amount = excluded.amount""",
+    "DELETE FROM staging",
+)
+
+# Totals of every property, worked out by SQLite. roi is NULL when there is no investment.
+_TOTALS = """
+SELECT property_id, monthly_income, monthly_expenses, total_investment,
+       (monthly_income - monthly_expenses) * 12 AS yearly_cashflow,
+       (monthly_income - monthly_expenses) * 1200 / NULLIF(total_investment, 0) AS roi
+FROM (
+    SELECT properties.id, properties.property_id,
+           total(CASE WHEN kind = 0 THEN amount END) AS monthly_income,
+           total(CASE WHEN kind = 1 THEN amount END) AS monthly_expenses,
+           total(CASE WHEN kind = 2 THEN amount END) AS total_investment
+    FROM properties LEFT JOIN line_items ON line_items.property = properties.id
+    {where}
+    GROUP BY properties.id
+)
+ORDER BY id
+"""
+
+def _kind_code(kind:str):
+    """
+    Function to turn 'income', 'expense', or 'investment' into its stored code
+    """
+    try:
+        return source_types.index(kind.strip().lower())
+    except ValueError:
+        raise ValueError(f"kind must be 'income', 'expense', or 'investment', not {kind!r}") from None
+
+class RentalStore():
+    """
+    Class to keep properties and their line items in a SQLite database that many jobs can share.
+    Property ids are stored as strings and source names are lowercased like Rental does.
+    Writes are done in bulk: rows are staged with executemany and upserted with a few set-based
+    statements, all inside one transaction, so a batch is saved completely or not at all.
+    Totals and ROI are summed by SQLite with plain (not compensated) sums, so they can differ from
+    the Rental getters in the last digit.
+    """
+    def __init__(self,file_name:str=":memory:") -> None:
+        self.connection = sqlite3.connect(file_name)
+        # WAL lets readers in other processes keep reading while a batch is written
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(_SCHEMA + _STAGING)
+        self.connection.execute(_SOURCE_INDEX)
+
+    def __len__(self):
+        return self.connection.execute("SELECT count(*) FROM properties").fetchone()[0]
+
+    def __contains__(self,property_id):
+        return self.connection.execute("SELECT 1 FROM properties WHERE property_id = ?",(str(property_id),)).fetchone() is not None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,*exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Method to close the database
+        """
+        self.connection.close()
+
+    def _merge_staging(self):
+        """
+        Method to upsert the staged rows into the tables. Must run inside a transaction.
+        """
+        staged = self.connection.execute("SELECT count(*) FROM staging").fetchone()[0]
+        stored = self.connection.execute("SELECT count(*) FROM line_items").fetchone()[0]
+        # Adding more rows than are stored is faster without the source index, building it again afterwards
+        rebuild_index = staged > stored
+        if rebuild_index:
+            self.connection.execute("DROP INDEX line_items_source")
+        for statement in _UPSERT_STAGING:
+            self.connection.execute(statement)
+        if rebuild_index:
+            self.connection.execute(_SOURCE_INDEX)
+
+    def upsert_line_items(self,rows):
+        """
+        Method to add or update line items from an iterable of (property, kind, source, amount) rows, like the
+        rows of a ledger file from rental_import.iter_ledger_rows. Existing line items keep their place and get
+        the new amount, and if a line item appears more than once the last row wins. Returns the number of rows.
+        """
+        count = 0
+        def staged():
+            nonlocal count
+            for property_id,kind,source,amount in rows:
+                count += 1
+                yield str(property_id),_kind_code(kind),source.strip().lower(),float(amount)
+        with self.connection:
+            self.connection.executemany("INSERT INTO staging VALUES (?, ?, ?, ?)",staged())
+            self._merge_staging()
+        return count
+
+    def save_rentals(self,rentals):
+        """
+        Method to save Rentals, replacing the line items of any property that is already stored.
+        rentals can be a dict of property id to Rental, (property id, Rental) pairs, or a RentalPortfolio.
+        Returns the number of properties saved.
+        """
+        if isinstance(rentals,dict):
+            rentals = rentals.items()
+        elif hasattr(rentals,"rentals"):
+            rentals = rentals.rentals()
+        property_ids = []
+        def staged():
+            for property_id,rental in rentals:
+                property_id = str(property_id)
+                property_ids.append((property_id,))
+                for kind,source_dict in enumerate((rental.income_dict,rental.expense_dict,rental.investment_dict)):
+                    for source,amount in source_dict.items():
+                        yield property_id,kind,source,amount
+        with self.connection:
+            self.connection.executemany("INSERT INTO staging VALUES (?, ?, ?, ?)",staged())
+            # Properties without any line items still need a row
+            self.connection.executemany("INSERT INTO properties (property_id) VALUES (?) ON CONFLICT DO NOTHING",property_ids)
+            self.connection.executemany(
+                "DELETE FROM line_items WHERE property = (SELECT id FROM properties WHERE property_id = ?)",property_ids)
+            self._merge_staging()
+        return len(property_ids)
+
+    def remove_property(self,property_id):
+        """
+        Method to remove a property and its line items
+        """
+        with self.connection:
+            cursor = self.connection.execute("DELETE FROM properties WHERE property_id = ?",(str(property_id),))
+        if not cursor.rowcount:
+            raise KeyError(property_id)
+
+    def remove_line_item(self,property_id,kind:str,source:str):
+        """
+        Method to remove a single line item
+        """
+        with self.connection:
+            cursor = self.connection.execute(
+                """DELETE FROM line_items
+                   WHERE property = (SELECT id FROM properties WHERE property_id = ?)
+                   AND kind = ? AND source = (SELECT id FROM sources WHERE name = ?)""",
+                (str(property_id),_kind_code(kind),source.lower()))
+        if not cursor.rowcount:
+            raise KeyError((property_id,kind,source))
+
+    def _line_items(self,where:str="",parameters=()):
+        return self.connection.execute(
+            f"""SELECT properties.property_id, line_items.kind, sources.name, line_items.amount
+                FROM line_items
+                JOIN properties ON properties.id = line_items.property
+                JOIN sources ON sources.id = line_items.source
+                {where}
+                ORDER BY line_items.property, line_items.id""",parameters)
+
+    def get_rental(self,property_id) -> Rental:
+        """
+        Method to load a single property as a Rental
+        """
+        if property_id not in self:
+            raise KeyError(property_id)
+        rental = Rental()
+        for _,kind,source,amount in self._line_items("WHERE properties.property_id = ?",(str(property_id),)):
+            rental.set_source(source_types[kind],source,amount)
+        return rental
+
+    def rentals(self):
+        """
+        Method to iterate over (property id, Rental) pairs for every property with line items, reading
+        the line items as one stream instead of one query per property
+        """
+        property_id = rental = None
+        for row_property_id,kind,source,amount in self._line_items():
+            if row_property_id != property_id:
+                if rental is not None:
+                    yield property_id, rental
+                property_id,rental = row_property_id,Rental()
+            rental.set_source(source_types[kind],source,amount)
+        if rental is not None:
+            yield property_id, rental
+
+    def totals(self):
+        """
+        Method to get (property id, monthly income, monthly expenses, total investment, yearly cashflow, roi)
+        for every property, in the order they were first saved. roi is None when there is no investment.
+        """
+        return self.connection.execute(_TOTALS.format(where="")).fetchall()
+
+    def get_totals(self,property_id):
+        """
+        Method to get the totals row of a single property, like totals()
+        """
+        row = self.connection.execute(_TOTALS.format(where="WHERE properties.property_id = ?"),(str(property_id),)).fetchone()
+        if row is None:
+            raise KeyError(property_id)
+        return row
+
+    def source_total(self,kind:str,source:str):
+        """
+        Method to get the total of one source across every property, like the total of every 'insurance' expense.
+        Returns (total, number of properties with the source).
+        """
+        return self.connection.execute(
+            """SELECT total(amount), count(*) FROM line_items
+               WHERE kind = ? AND source = (SELECT id FROM sources WHERE name = ?)""",
+            (_kind_code(kind),source.lower())).fetchone()
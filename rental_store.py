@@ -0,0 +1,229 @@
+import mmap
+
+import numpy as np
+
+from rental_property_program import Rental
+from rental_portfolio import RentalPortfolio, as_portfolio
+
+# File layout, all little endian and every section starting on an 8 byte boundary:
+#   header       magic, then int64 counts of properties, line items, sources,
+#                property id bytes, and source name bytes
+#   totals       float64[properties, 3] monthly income, monthly expenses, total investment
+#   offsets      int64[properties + 1], line items of property i are offsets[i]:offsets[i + 1]
+#   amounts      float64[line items]
+#   sources      int32[line items], index into the source name table
+#   types        int8[line items], 0 income, 1 expense, 2 investment
+#   source names int64[sources + 1] offsets into a UTF-8 blob of every distinct source name
+#   property ids int64[properties + 1] offsets into a UTF-8 blob of every property id
+MAGIC = b"RENTALS\x01"
+_HEADER = np.dtype([("magic","S8"),("properties","<i8"),("items","<i8"),("sources","<i8"),("id_bytes","<i8"),("name_bytes","<i8")])
+
+def _padding(size:int):
+    """
+    Function to get the zero bytes that pad a section of size bytes to an 8 byte boundary
+    """
+    return b"\0" * (-size % 8)
+
+def _string_table(strings):
+    """
+    Function to pack strings into (int64 offsets, UTF-8 blob)
+    """
+    encoded = [string.encode() for string in strings]
+    offsets = np.zeros(len(encoded) + 1,dtype="<i8")
+    np.cumsum([len(string) for string in encoded],out=offsets[1:])
+    return offsets, b"".join(encoded)
+
+def save_portfolio(rentals,file_name:str):
+    """
+    Function to save a RentalPortfolio, or a dict of property id to Rental, to a binary file that
+    MappedPortfolio can open. Property ids are saved as strings.
+    """
+    portfolio = as_portfolio(rentals)
+    rows,type_codes,source_ids,amounts = portfolio.columns()
+    # A stable sort groups line items by property and keeps them in the order they were added
+    order = np.argsort(rows,kind="stable")
+    offsets = np.zeros(len(portfolio) + 1,dtype="<i8")
+    np.cumsum(np.bincount(rows,minlength=len(portfolio)),out=offsets[1:])
+    id_offsets,id_blob = _string_table(str(property_id) for property_id in portfolio.property_ids)
+    name_offsets,name_blob = _string_table(portfolio.source_names)
+
+    header = np.zeros(1,dtype=_HEADER)
+    header[0] = (MAGIC,len(portfolio),len(amounts),len(portfolio.source_names),len(id_blob),len(name_blob))
+    sections = [
+        header.tobytes(),
+        np.ascontiguousarray(portfolio.get_totals(),dtype="<f8").tobytes(),
+        offsets.tobytes(),
+        amounts[order].astype("<f8").tobytes(),
+        source_ids[order].astype("<i4").tobytes(),
+        type_codes[order].astype("i1").tobytes(),
+        name_offsets.tobytes(),
+        name_blob,
+        id_offsets.tobytes(),
+        id_blob,
+    ]
+    with open(file_name,"wb") as file:
+        for section in sections:
+            file.write(section)
+            file.write(_padding(len(section)))
+
+class MappedPortfolio():
+    """
+    Class to read a file written by save_portfolio through mmap. Nothing is loaded up front:
+    the columns are NumPy views of the file, so the operating system only reads the pages a query touches.
+    Has the same portfolio getters as RentalPortfolio.
+    """
+    def __init__(self,file_name:str) -> None:
+        with open(file_name,"rb") as file:
+            self._mmap = mmap.mmap(file.fileno(),0,access=mmap.ACCESS_READ)
+        # A copy, so the header doesn't hold on to the mmap
+        header = np.frombuffer(self._mmap,dtype=_HEADER,count=1).copy()[0]
+        if header["magic"] != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{file_name} is not a rental portfolio file")
+        n = int(header["properties"])
+        n_items = int(header["items"])
+        n_sources = int(header["sources"])
+        self._position = _HEADER.itemsize + len(_padding(_HEADER.itemsize))
+        self.totals = self._section("<f8",n * 3).reshape(n,3)
+        self.offsets = self._section("<i8",n + 1)
+        self.amounts = self._section("<f8",n_items)
+        self.source_ids = self._section("<i4",n_items)
+        self.type_codes = self._section("i1",n_items)
+        self._name_offsets = self._section("<i8",n_sources + 1)
+        self._name_blob = self._section("u1",int(header["name_bytes"]))
+        self._id_offsets = self._section("<i8",n + 1)
+        self._id_blob = self._section("u1",int(header["id_bytes"]))
+        self._source_names = dict()
+        self._rows = None
+
+    def _section(self,dtype:str,count:int):
+        """
+        Method to map the next section of the file as a NumPy array
+        """
+        array = np.frombuffer(self._mmap,dtype=dtype,count=count,offset=self._position)
+        self._position += array.nbytes + len(_padding(array.nbytes))
+        return array
+
+    def close(self):
+        """
+        Method to close the portfolio. The file is unmapped right away unless arrays taken from the portfolio,
+        like the results of the getters, are still in use. Those stay valid, and the file is unmapped once
+        the last of them is garbage collected.
+        """
+        if self._mmap is None:
+            return
+        # The sections are views of the mmap, so they have to be dropped before it can be closed
+        for name in ("totals","offsets","amounts","source_ids","type_codes","_name_offsets","_name_blob","_id_offsets","_id_blob"):
+            setattr(self,name,None)
+        try:
+            self._mmap.close()
+        except BufferError:
+            # A view the caller kept still exports the mmap's buffer, and holds a reference to it until it is collected
+            pass
+        self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,*exc_info):
+        self.close()
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def property_id(self,row:int):
+        """
+        Method to get the property id saved for a row
+        """
+        return bytes(self._id_blob[self._id_offsets[row]:self._id_offsets[row + 1]]).decode()
+
+    def source_name(self,source_id:int):
+        """
+        Method to get a source name from the source name table
+        """
+        name = self._source_names.get(source_id)
+        if name is None:
+            name = bytes(self._name_blob[self._name_offsets[source_id]:self._name_offsets[source_id + 1]]).decode()
+            self._source_names[source_id] = name
+        return name
+
+    def row_of(self,property_id):
+        """
+        Method to get the row of a property id. The first call reads every property id to build the lookup.
+        """
+        if self._rows is None:
+            self._rows = {self.property_id(row):row for row in range(len(self))}
+        return self._rows[str(property_id)]
+
+    def get_rental(self,property_id) -> Rental:
+        """
+        Method to load a single property as a Rental. Only the pages holding its line items are read.
+        """
+        row = self.row_of(property_id)
+        start,stop = self.offsets[row],self.offsets[row + 1]
+        rental = Rental()
+        setters = (rental.update_income_source,rental.update_expense,rental.update_investment)
+        for type_code,source_id,amount in zip(self.type_codes[start:stop],self.source_ids[start:stop],self.amounts[start:stop]):
+            setters[type_code](self.source_name(source_id),float(amount))
+        return rental
+
+    def to_portfolio(self) -> RentalPortfolio:
+        """
+        Method to load the whole file into a RentalPortfolio
+        """
+        portfolio = RentalPortfolio()
+        rows = np.repeat(np.arange(len(self)),np.diff(self.offsets))
+        for row in range(len(self)):
+            portfolio.add_property(self.property_id(row))
+        for row,type_code,source_id,amount in zip(rows,self.type_codes,self.source_ids,self.amounts):
+            portfolio.add_line_item(portfolio.property_ids[row],RentalPortfolio.source_types[type_code],self.source_name(source_id),float(amount))
+        return portfolio
+
+    def get_monthly_income(self):
+        """
+        Method to get monthly income of every property
+        """
+        return self.totals[:,0]
+
+    def get_monthly_expenses(self):
+        """
+        Method to get monthly expenses of every property
+        """
+        return self.totals[:,1]
+
+    def get_total_investment(self):
+        """
+        Method to get total investment of every property
+        """
+        return self.totals[:,2]
+
+    def get_yearly_income(self):
+        """
+        Method to get yearly income of every property
+        """
+        return self.get_monthly_income() * 12
+
+    def get_yearly_expenses(self):
+        """
+        Method to get yearly expenses of every property
+        """
+        return self.get_monthly_expenses() * 12
+
+    def get_monthly_cashflow(self):
+        """
+        Method to get monthly cashflow of every property
+        """
+        return self.get_monthly_income() - self.get_monthly_expenses()
+
+    def get_yearly_cashflow(self):
+        """
+        Method to get yearly cashflow of every property
+        """
+        return self.get_monthly_cashflow() * 12
+
+    def get_yearly_roi(self):
+        """
+        Method to get yearly cash on cash return on investment of every property, as an unrounded percentage
+        """
+        with np.errstate(divide="ignore",invalid="ignore"):
+            return self.get_yearly_cashflow() * 100 / self.get_total_investment()
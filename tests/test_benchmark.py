@@ -0,0 +1,19 @@
+from rental_benchmark import compare
+
+def _run(export_files,files_per_second,seconds_per_call=1e-6,bytes_per_property=1000):
+    return {"results":[
+        {"name":"get_monthly_income","line_items":10,"seconds_per_call":seconds_per_call},
+        {"name":"export_summary","line_items":30,"files":export_files,"seconds":export_files / files_per_second,
+         "files_per_second":files_per_second},
+        {"name":"memory Rental","line_items":15,"bytes_per_property":bytes_per_property},
+    ]}
+
+def test_quick_and_full_export_runs_are_not_compared():
+    assert compare(_run(1000,5000),_run(100,5000),.2) == []
+    assert compare(_run(100,5000),_run(1000,5000),.2) == []
+
+def test_regressions_in_each_direction():
+    assert compare(_run(100,5000),_run(100,6000),.2) == []
+    assert compare(_run(100,5000),_run(100,3000),.2) == [("export_summary",30,"files_per_second",5000,3000)]
+    regressions = compare(_run(100,5000),_run(100,5000,seconds_per_call=2e-6,bytes_per_property=2000),.2)
+    assert [(name,metric) for name,_,metric,_,_ in regressions] == [("get_monthly_income","seconds_per_call"),("memory Rental","bytes_per_property")]
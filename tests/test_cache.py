@@ -0,0 +1,32 @@
+from rental_cache import EvaluationCache
+from rental_property_program import Rental
+
+def _rental(rent=1000):
+    rental = Rental()
+    rental.set_source("income","rent",rent)
+    rental.set_source("investment","down payment",10000)
+    return rental
+
+def test_identical_rentals_share_an_evaluation():
+    cache = EvaluationCache(maxsize=2)
+    first = cache.evaluate(_rental())
+    assert cache.evaluate(_rental()) is first
+    assert first.roi == 120 and first.roi_text == "120.00%"
+    assert cache.summary_rows(_rental(),"B")[0] == ["Rental Property Name","B"]
+    assert cache.summary_rows(_rental(),"C") == _rental().summary_rows("C")
+    assert cache.info() == {"hits":3,"misses":1,"size":1,"maxsize":2}
+
+def test_changed_rental_and_eviction():
+    cache = EvaluationCache(maxsize=2)
+    rental = _rental()
+    cache.evaluate(rental)
+    rental.update_income_source("rent",2000)
+    assert cache.evaluate(rental).monthly_income == 2000
+    cache.evaluate(_rental(3000))
+    assert len(cache) == 2 and cache.misses == 3
+    # The 1000 rent evaluation was the least recently used, so it was dropped
+    cache.evaluate(_rental())
+    assert cache.misses == 4
+    no_investment = Rental()
+    no_investment.set_source("income","rent",10)
+    assert cache.evaluate(no_investment).roi is None
@@ -0,0 +1,30 @@
+import pytest
+
+from rental_benchmark import bench_memory
+from rental_property_program import CentsRental, Rental
+
+def fill(rental):
+    rental.add_income_source("Rent",1000.10)
+    rental.add_expense("tax",100.20)
+    rental.add_expense("insurance",0.1)
+    rental.add_investment("down payment",20000)
+    return rental
+
+def test_matches_rental():
+    cents,rental = fill(CentsRental()),fill(Rental())
+    assert cents.summary_rows("x") == rental.summary_rows("x")
+    assert cents.get_total_cents("expense") == 10030
+    cents.remove_expense("tax")
+    assert dict(cents.expense_dict) == {"insurance":.1}
+    with pytest.raises(KeyError):
+        cents.remove_expense("tax")
+
+def test_dicts_are_read_only():
+    cents = fill(CentsRental())
+    with pytest.raises(TypeError):
+        cents.income_dict["rent"] = 999
+    assert cents.get_monthly_income() == 1000.10
+
+def test_uses_less_memory_than_rental():
+    results = {result["name"]:result["bytes_per_property"] for result in bench_memory(1_000)}
+    assert results["memory CentsRental"] < results["memory Rental"]
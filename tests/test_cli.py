@@ -0,0 +1,36 @@
+import json
+
+from rental_cli import main
+
+def test_bad_ledger_is_skipped_whole(tmp_path,capsys):
+    good = tmp_path / "good.csv"
+    good.write_text("E,income,rent,1000\nE,investment,down payment,10000\n")
+    bad = tmp_path / "bad.csv"
+    rows = []
+    for property_id in "ABCD":
+        rows.append(f"{property_id},income,rent,1000")
+        rows.append(f"{property_id},investment,down payment,10000")
+    rows[7] = "D,bogus,down payment,10000"
+    bad.write_text("\n".join(rows) + "\n")
+
+    assert main(["evaluate",str(bad),str(good)]) == 0
+    output = capsys.readouterr()
+    records = [json.loads(line) for line in output.out.splitlines()]
+    assert [record["property"] for record in records] == ["E"]
+    assert records[0]["roi"] == 120.
+    assert "Skipped" in output.err and "bad.csv" in output.err
+
+    assert main(["evaluate","--strict",str(bad),str(good)]) == 1
+
+def test_export_skips_properties_without_investment(tmp_path,capsys):
+    ledger = tmp_path / "ledger.csv"
+    ledger.write_text("A,income,rent,1000\nA,investment,dp,10000\nC,income,rent,500\n")
+    directory = tmp_path / "out"
+
+    assert main(["export",str(ledger),"--directory",str(directory)]) == 0
+    output = capsys.readouterr()
+    assert json.loads(output.out)["written"] == 1
+    assert "Skipped property C" in output.err
+    assert sorted(path.name for path in directory.iterdir()) == ["A_ValueEstimate.csv"]
+
+    assert main(["export","--strict",str(ledger),"--directory",str(directory)]) == 1
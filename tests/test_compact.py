@@ -0,0 +1,25 @@
+import pickle
+
+import pytest
+
+from rental_compact import CompactRental
+from rental_property_program import Rental
+
+def fill(rental):
+    rental.add_income_source("Rent",1000.10)
+    rental.add_expense("tax",100.20)
+    rental.add_investment("down payment",20000)
+    return rental
+
+def test_matches_rental():
+    compact,rental = fill(CompactRental()),fill(Rental())
+    assert compact.summary_rows("x") == rental.summary_rows("x")
+    restored = pickle.loads(pickle.dumps(compact))
+    assert dict(restored.expense_dict) == rental.expense_dict
+
+def test_dicts_are_read_only():
+    compact = fill(CompactRental())
+    for view in (compact.income_dict,compact.expense_dict,compact.investment_dict):
+        with pytest.raises(TypeError):
+            view["rent"] = 5
+    assert compact.get_monthly_income() == 1000.10
@@ -0,0 +1,52 @@
+import asyncio
+
+from rental_compact import CompactRental
+from rental_events import EventFeed
+from rental_property_program import Rental
+
+EVENTS = [
+    ("a","add","income","Rent",1000),
+    ("a","add","investment","down payment",100000),
+    ("a","update","income","rent",2000),
+    ("a","remove","income","rent",None),
+]
+
+def test_crossings_and_missing():
+    feed = EventFeed(thresholds=(10,20))
+    crossings = list(feed.process(EVENTS))
+    assert [(crossing.threshold,crossing.direction) for crossing in crossings] == [(20,"up"),(20,"down"),(10,"down")]
+    assert feed.roi["a"] == 0
+    assert list(feed.process([("a","remove","expense","tax",None),("b","remove","income","rent",None)])) == []
+    assert feed.missing == 2
+    assert feed.events == 6
+
+def test_remove_expense_drops_loan():
+    rental = Rental()
+    rental.add_investment("down payment",1000)
+    rental.loan_dict["mortgage"] = object()
+    rental.set_source("expense","mortgage",100)
+    feed = EventFeed({"a":rental})
+    feed.apply("a","remove","expense","Mortgage")
+    assert rental.loan_dict == {}
+
+def test_async_feed_with_compact_rentals():
+    async def events():
+        for event in EVENTS:
+            yield event
+    async def run(feed):
+        return [crossing async for crossing in feed.aprocess(events())]
+    feed = EventFeed(thresholds=(10,),rental_class=CompactRental)
+    assert [crossing.direction for crossing in asyncio.run(run(feed))] == ["down"]
+
+def test_rental_class_bugs_are_not_hidden():
+    class Broken(Rental):
+        def remove_income_source(self,source):
+            raise AttributeError("bug")
+    feed = EventFeed(rental_class=Broken)
+    feed.apply("a","add","income","rent",10)
+    try:
+        feed.apply("a","remove","income","rent")
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("AttributeError was swallowed")
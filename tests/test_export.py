@@ -0,0 +1,14 @@
+import pytest
+
+from rental_export import export_summaries
+from rental_property_program import Rental
+
+def test_failed_summary_leaves_no_file(tmp_path,monkeypatch):
+    rental = Rental()
+    rental.set_source("income","rent",500)
+    with pytest.raises(ZeroDivisionError):
+        export_summaries({"C":rental},str(tmp_path))
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(ZeroDivisionError):
+        rental.export_summary("C")
+    assert list(tmp_path.iterdir()) == []
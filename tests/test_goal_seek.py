@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from rental_financing import monthly_payment
+from rental_goal_seek import goal_seek, max_expense, max_investment, max_purchase_price, min_income
+from rental_portfolio import RentalPortfolio
+from rental_property_program import Rental
+
+def _rentals():
+    good,poor = Rental(),Rental()
+    for rental,rent in ((good,2000),(poor,100)):
+        rental.set_source("income","rent",rent)
+        rental.set_source("expense","tax",200)
+        rental.set_source("investment","down payment",20000)
+    return {"good":good,"poor":poor}
+
+def _roi_with(rental,source_type,source,amount):
+    rental.set_source(source_type,source,float(amount))
+    return rental.get_yearly_roi()
+
+def test_closed_form_answers_reach_the_target():
+    rentals = _rentals()
+    investment = max_investment(rentals,8)
+    assert _roi_with(_rentals()["good"],"investment","down payment",investment[0]) == pytest.approx(8)
+    assert np.isnan(investment[1])
+    income = min_income(rentals,8)
+    assert [_roi_with(_rentals()[name],"income","rent",amount) for name,amount in zip(rentals,income)] == pytest.approx([8,8])
+    expense = max_expense(rentals,8,"tax")
+    assert _roi_with(_rentals()["good"],"expense","tax",expense[0]) == pytest.approx(8)
+    assert np.isnan(expense[1])
+
+def test_goal_seek_agrees_with_closed_form():
+    portfolio = RentalPortfolio.from_rentals(_rentals())
+    cashflow = portfolio.get_yearly_cashflow()
+    answers = goal_seek(lambda amount: cashflow * 100 / amount,8,1.,1e6,tolerance=1e-6)
+    assert answers[0] == pytest.approx(max_investment(portfolio,8)[0],abs=1e-5)
+    assert np.isnan(answers[1])
+
+def test_purchase_price_is_financed():
+    price = max_purchase_price(_rentals(),8,annual_rate=.06)
+    assert np.isnan(price[1])
+    rental = _rentals()["good"]
+    rental.set_source("investment","down payment",price[0] * .2)
+    rental.set_source("expense","mortgage",float(monthly_payment(price[0] * .8,.06,30)))
+    assert rental.get_yearly_roi() == pytest.approx(8)
@@ -0,0 +1,54 @@
+import csv
+
+import pytest
+
+from rental_export import export_summaries
+from rental_import import load_ledger, load_summaries, read_summary
+from rental_property_program import Rental
+
+def make_rental():
+    rental = Rental()
+    rental.add_income_source("rent",2000)
+    rental.add_expense("tax",300.25)
+    rental.add_expense("insurance",1_250)
+    rental.add_investment("down payment",50000)
+    return rental
+
+def test_summary_round_trip(tmp_path):
+    rental = make_rental()
+    export_summaries({"Main St":rental},tmp_path)
+    loader = load_summaries(tmp_path)
+    assert loader.errors == {}
+    loaded = loader.rentals["Main St"]
+    assert loaded.income_dict == rental.income_dict
+    assert loaded.expense_dict == rental.expense_dict
+    assert loaded.investment_dict == rental.investment_dict
+
+@pytest.mark.parametrize("cut_after",["tax","Total Monthly Expense","Total Investment"])
+def test_truncated_summary_is_an_error(tmp_path,cut_after):
+    export_summaries({"Main St":make_rental()},tmp_path)
+    file_name = tmp_path / "Main_St_ValueEstimate.csv"
+    with open(file_name,newline="") as file:
+        rows = list(csv.reader(file))
+    cut = next(i for i,row in enumerate(rows) if len(row) == 2 and row[1] == cut_after)
+    with open(file_name,"w",newline="") as file:
+        csv.writer(file).writerows(rows[:cut + 1])
+
+    with pytest.raises(ValueError):
+        read_summary(str(file_name))
+    loader = load_summaries(tmp_path)
+    assert loader.rentals == {}
+    assert list(loader.errors) == [str(file_name)]
+
+@pytest.mark.parametrize("name,text",[
+    ("ledger.csv","property,kind,source,amount\nA,income,rent,1000\nA,expense,tax,abc\n"),
+    ("ledger.jsonl",'{"property":"A","kind":"income","source":"rent","amount":1000}\n\n'
+                    '{"property":"A","kind":"expense","source":"tax","amount":"abc"}\n'),
+])
+def test_bad_amount_names_file_and_line(tmp_path,name,text):
+    file_name = tmp_path / name
+    file_name.write_text(text)
+    with pytest.raises(ValueError,match=rf"{name} line 3: .*abc"):
+        load_ledger(str(file_name))
+    file_name.write_text(text.replace("abc","15"))
+    assert load_ledger(str(file_name)).rentals["A"].get_monthly_cashflow() == 985
@@ -0,0 +1,20 @@
+import numpy as np
+
+from rental_irr import irr, npv
+
+def test_exact_root_at_guess():
+    # NPV is exactly 0 at the default guess of 10%
+    result = irr([[-100,10,10,110]])
+    assert result.converged[0]
+    assert result.irr[0] == .1
+
+def test_non_trivial_root():
+    cashflows = np.array([[-150_000,9_000,9_500,10_000,10_500,190_000]])
+    result = irr(cashflows)
+    assert result.converged[0]
+    assert not result.multiple_roots[0]
+    assert abs(npv(cashflows,result.irr)[0]) < 1e-6
+    # Matches the positive real root of the polynomial in 1 / (1 + rate)
+    x = np.roots(cashflows[0][::-1])
+    x = x[np.isreal(x) & (x.real > 0)].real
+    assert np.isclose(result.irr[0],1 / x[0] - 1)
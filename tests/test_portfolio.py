@@ -0,0 +1,49 @@
+import random
+
+import numpy as np
+import pytest
+
+from rental_portfolio import RentalPortfolio
+from rental_property_program import Rental
+
+source_types = ("income","expense","investment")
+
+def _random_history(seed:int,properties:int=20,steps:int=300):
+    """
+    Function to apply the same random adds, updates, and removes to Rentals and a RentalPortfolio
+    """
+    rng = random.Random(seed)
+    rentals = {property_id:Rental() for property_id in range(properties)}
+    portfolio = RentalPortfolio()
+    for property_id in rentals:
+        portfolio.add_property(property_id)
+    sources = [f"Source {i}" for i in range(8)]
+    for _ in range(steps):
+        property_id = rng.randrange(properties)
+        rental = rentals[property_id]
+        source_type = rng.choice(source_types)
+        source = rng.choice(sources)
+        if rng.random() < .25 and source.lower() in rental._source_dict(source_type):
+            {"income":rental.remove_income_source,"expense":rental.remove_expense,"investment":rental.remove_investment}[source_type](source)
+            portfolio.remove_line_item(property_id,source_type,source)
+        else:
+            amount = round(rng.uniform(0,5000),2)
+            assert rental.set_source(source_type,source,amount) == portfolio.add_line_item(property_id,source_type,source,amount)
+    return rentals,portfolio
+
+@pytest.mark.parametrize("seed",range(5))
+def test_matches_rental_after_updates_and_removes(seed):
+    rentals,portfolio = _random_history(seed)
+    for name in ("get_monthly_income","get_monthly_expenses","get_total_investment","get_yearly_income",
+                 "get_yearly_expenses","get_monthly_cashflow","get_yearly_cashflow"):
+        expected = [getattr(rentals[property_id],name)() for property_id in portfolio.property_ids]
+        assert np.allclose(getattr(portfolio,name)(),expected,rtol=0,atol=1e-9), name
+    with np.errstate(divide="ignore",invalid="ignore"):
+        roi = portfolio.get_yearly_roi()
+    for row,property_id in enumerate(portfolio.property_ids):
+        rental = rentals[property_id]
+        if rental.get_total_investment():
+            assert roi[row] == pytest.approx(rental.get_yearly_roi())
+        extracted = portfolio.get_rental(property_id)
+        for source_type in source_types:
+            assert list(extracted._source_dict(source_type).items()) == list(rental._source_dict(source_type).items())
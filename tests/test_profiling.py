@@ -0,0 +1,60 @@
+import contextlib
+import io
+
+import rental_export
+import rental_profiling
+import rental_property_program
+from rental_benchmark import SCRIPT
+
+def test_helpers_and_sleeps_are_recorded_separately(tmp_path,monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # Record the sleeps without waiting for them
+    monkeypatch.setattr(rental_property_program,"sleep",lambda seconds: None)
+    script = SCRIPT[:-1] + ["y","Main St"]
+    rental_profiling.reset()
+    rental_profiling.enable()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            rental_property_program.rental_property_calculator(script)
+    finally:
+        rental_profiling.disable()
+    assert rental_property_program.helper_wrapper is None
+
+    stats = rental_profiling.stats
+    for name in ("calculator.p","calculator.get_valid_money","calculator.get_y_or_n","calculator.summary",
+                 "calculator.format_money","sleep (typing effects in p)","sleep (pauses in summary)",
+                 "Rental.export_summary (money formatting)","Rental.export_summary (CSV write)"):
+        assert stats[name][0] > 0, name
+    # summary() pauses for 1 second once and 3 seconds four times, outside of p()
+    assert stats["sleep (pauses in summary)"][0] == 5
+    assert stats["Rental.export_summary (money formatting)"][0] == 1
+    assert rental_profiling.io_stats["export_summary"]["files"] == 1
+
+def test_batch_export_and_compact_rentals_are_recorded(tmp_path):
+    from rental_compact import CompactRental
+    from rental_export import export_summaries, render_summaries
+
+    rentals = dict()
+    for i in range(3):
+        rental = CompactRental()
+        rental.set_source("income","rent",1000 + i)
+        rental.set_source("investment","down payment",10000)
+        rentals[f"Property {i}"] = rental
+    rental_profiling.reset()
+    with rental_profiling.profiled(io.StringIO()):
+        rental_export.export_summaries(rentals,str(tmp_path))
+        rental_export.export_summaries(rentals,str(tmp_path),"single")
+        CompactRental.get_monthly_income(rentals["Property 0"])
+    assert rental_export.export_summaries is export_summaries
+    assert rental_export.render_summaries is render_summaries
+
+    stats,io_stats = rental_profiling.stats,rental_profiling.io_stats
+    assert stats["CompactRental.summary_rows"][0] == 6
+    assert stats["CompactRental.get_monthly_income"][0] >= 1
+    assert stats["export_summaries (money formatting)"][1] > 0
+    assert stats["render_summaries (CSV rendering)"][0] == 1
+    assert stats["export_summaries (total)"][0] == 2
+    files = sorted(tmp_path.glob("Property_*_ValueEstimate.csv"))
+    assert io_stats["export_summaries"]["files"] == 3
+    assert io_stats["export_summaries"]["bytes"] == sum(path.stat().st_size for path in files)
+    assert io_stats["export_summaries (single file)"]["bytes"] == (tmp_path / "Portfolio_ValueEstimate.csv").stat().st_size
@@ -0,0 +1,41 @@
+import numpy as np
+
+from rental_financing import Loan
+from rental_portfolio import RentalPortfolio
+from rental_projection import project
+from rental_property_program import Rental
+
+def _rental():
+    rental = Rental()
+    rental.set_source("income","rent",2000)
+    rental.set_source("expense","tax",200)
+    rental.set_source("investment","down payment",50000)
+    return rental
+
+def test_added_loan_is_projected_like_a_mortgage():
+    with_loan = _rental()
+    with_loan.add_loan("Mortgage",Loan(100000,.06,10))
+    projected = project({"a":with_loan,"b":_rental()},years=15,expense_growth=.03,property_value=150000)
+    expected = project({"a":_rental()},years=15,expense_growth=.03,property_value=150000,mortgage=Loan(100000,.06,10))
+    assert np.allclose(projected.cashflow[0],expected.cashflow[0])
+    assert np.allclose(projected.equity[0],expected.equity[0])
+    # The payment stops after the 10 year term, so cashflow jumps in year 11
+    assert projected.cashflow[0,10] > projected.cashflow[0,9] + 12 * 1000
+    assert np.allclose(projected.equity[1],150000)
+
+def test_portfolio_keeps_loans():
+    rental = _rental()
+    rental.add_loan("mortgage",Loan(100000,.06,10))
+    portfolio = RentalPortfolio.from_rentals({"a":rental})
+    assert portfolio.get_rental("a").loan_dict == rental.loan_dict
+    portfolio.remove_line_item("a","expense","Mortgage")
+    assert portfolio.loans["a"] == {}
+
+def test_growth_grid_and_cumulative_roi():
+    projected = project(_rental(),years=3,income_growth=np.array([0,.1])[:,None],expense_growth=np.array([0,.05]))
+    assert projected.cashflow.shape == (2,2,1,3)
+    assert np.allclose(projected.cashflow[0,0,0],1800 * 12)
+    rent,tax = 2000 * 12 * 1.1 ** 2,200 * 12 * 1.05 ** 2
+    assert np.isclose(projected.cashflow[1,1,0,2],rent - tax)
+    assert np.allclose(projected.cumulative_roi[0,0,0],np.cumsum([1800 * 12] * 3) * 100 / 50000)
+    assert projected.equity is None
@@ -0,0 +1,26 @@
+from rental_property_program import Rental
+from rental_query import PortfolioQuery
+
+def _rentals():
+    rentals = dict()
+    for i in range(10):
+        rental = Rental()
+        rental.set_source("income","rent",1000 + 100 * i)
+        if i % 2:
+            rental.set_source("expense","hoa fees",50)
+        if i != 9:
+            rental.set_source("investment","down payment",10000)
+        rentals[f"P{i}"] = rental
+    return rentals
+
+def test_top_between_and_expense_filters():
+    query = PortfolioQuery(_rentals())
+    # P9 has no investment, so it has no ROI to rank by
+    assert query.ids(query.top(3)) == ["P8","P7","P6"]
+    assert query.ids(query.top(2,largest=False)) == ["P0","P1"]
+    assert query.ids(query.top(2,by="monthly_cashflow")) == ["P9","P8"]
+    assert query.ids(query.between("roi",130,150)) == ["P2","P3"]
+    with_hoa = query.with_expense("HOA Fees")
+    assert query.ids(query.top(10,rows=query.narrow(with_hoa,query.between("roi",low=140)))) == ["P7","P5","P3"]
+    assert len(query.without_expense("hoa fees")) == 5
+    assert len(query.with_expense("insurance")) == 0
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from rental_property_program import Rental
+from rental_rollup import CategoryIndex
+
+def _rental(rent,tax,insurance=None):
+    rental = Rental()
+    if rent:
+        rental.set_source("income","rent",rent)
+    rental.set_source("expense","tax",tax)
+    if insurance:
+        rental.set_source("expense","flood insurance",insurance)
+    rental.set_source("investment","down payment",10000)
+    return rental
+
+def _index():
+    rentals = {"a":_rental(1000,100,50),"b":_rental(2000,400),"c":_rental(0,300,20)}
+    index = CategoryIndex(rentals,{"flood insurance":"insurance"})
+    index.add_tag("market",{"a":"Austin","b":"Austin","c":"X"})
+    return index
+
+def test_zero_rent_share_is_left_out():
+    index = _index()
+    share = index.share(("expense","tax"),("income","rent"))
+    assert share.tolist()[:2] == [.1,.2]
+    assert np.isinf(share[2])
+    assert index.rollup(share,stat="mean") == pytest.approx(.15)
+    assert index.rollup(share,stat="count") == 2
+    by_market = index.rollup(share,by="market",stat="mean")
+    assert by_market["Austin"] == pytest.approx(.15)
+    assert np.isnan(by_market["X"])
+    assert index.rollup(share,by="market",stat="count") == {"Austin":2,"X":0}
+    assert index.rollup(share,by="market",stat="percentile")["Austin"] == pytest.approx(.15)
+
+def test_categories_and_totals():
+    index = _index()
+    assert index.values("expense","insurance").tolist() == [50,0,20]
+    assert index.totals("expense") == {"tax":800,"insurance":70}
+    assert index.rollup(index.values("income","rent"),by="market") == {"Austin":3000,"X":0}
@@ -0,0 +1,39 @@
+import numpy as np
+
+from rental_export import export_summaries
+from rental_portfolio import RentalPortfolio
+from rental_property_program import Rental
+from rental_sharded import evaluate_sharded
+
+def _rentals(n:int=50):
+    rentals = dict()
+    for i in range(n):
+        rental = Rental()
+        rental.set_source("income","rent",1000 + i * 10.01)
+        if i % 3:
+            rental.set_source("income","laundry",i)
+        rental.set_source("expense","tax",100 + i)
+        if i % 5:
+            rental.set_source("investment","down payment",20000 + i * 100)
+        rentals[f"P{i}"] = rental
+    return rentals
+
+def test_matches_portfolio():
+    rentals = _rentals()
+    portfolio = RentalPortfolio.from_rentals(rentals)
+    result = evaluate_sharded(portfolio,workers=2,shards=7)
+    assert result.property_ids == portfolio.property_ids
+    assert np.array_equal(result.monthly_income,portfolio.get_monthly_income())
+    assert np.array_equal(result.monthly_expenses,portfolio.get_monthly_expenses())
+    assert np.array_equal(result.total_investment,portfolio.get_total_investment())
+    with np.errstate(divide="ignore",invalid="ignore"):
+        assert np.array_equal(result.roi,portfolio.get_yearly_roi(),equal_nan=True)
+
+def test_single_file_export_matches_export_summaries(tmp_path):
+    rentals = {property_id:rental for property_id,rental in _rentals(20).items() if rental.get_total_investment()}
+    (tmp_path / "sharded").mkdir()
+    (tmp_path / "serial").mkdir()
+    evaluate_sharded(rentals,workers=2,export_directory=str(tmp_path / "sharded"),layout="single")
+    export_summaries(rentals,str(tmp_path / "serial"),layout="single")
+    name = "Portfolio_ValueEstimate.csv"
+    assert (tmp_path / "sharded" / name).read_text() == (tmp_path / "serial" / name).read_text()
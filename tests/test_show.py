@@ -0,0 +1,65 @@
+import contextlib
+import io
+
+import pytest
+
+from rental_compact import CompactRental
+from rental_property_program import CentsRental, Rental
+
+# (dict, amount header, name header, total labels) of each show method
+sections = {
+    "income":("income_dict","Monthly Income","Source Name",("Total Monthly Income","Total Yearly Income")),
+    "expense":("expense_dict","Monthly Expenses","Expense Name",("Total Monthly Expense","Total Yearly Expense")),
+    "investment":("investment_dict","Investment Amount","Investment Name",("Total Investment",)),
+}
+
+def baseline_show(rental,source_type:str):
+    """
+    Function to print a table the way the show_* methods did before they were rendered in one write
+    """
+    dict_name,header,name_header,labels = sections[source_type]
+    source_dict = getattr(rental,dict_name)
+    format_money = lambda x: f"{x:,.2f}"
+    width = max(len(format_money(max(source_dict.values()))),len(header)-2)
+    print()
+    print(header.rjust(width+2),"/",name_header)
+    print()
+    for source,amount in source_dict.items():
+        print("$",format_money(amount).rjust(width),"/",source)
+    if source_type == "investment":
+        print("\nTotal Investment")
+        print("$",format_money(rental.get_total_investment()))
+        return
+    monthly = rental.get_monthly_income() if source_type == "income" else rental.get_monthly_expenses()
+    print(f"\n{labels[0]}")
+    print("$",format_money(monthly))
+    print(f"\n{labels[1]}")
+    print("$",format_money(monthly * 12),"\n")
+
+def _output(function,*args):
+    with contextlib.redirect_stdout(io.StringIO()) as buffer:
+        function(*args)
+    return buffer.getvalue()
+
+def _fill(rental):
+    for i,amount in enumerate((0,9.999,1234567.891,12,.5)):
+        rental.set_source("income",f"income {i}",amount)
+        rental.set_source("expense",f"expense {i}",amount / 3)
+        rental.set_source("investment",f"investment {i}",amount * 10)
+    return rental
+
+@pytest.mark.parametrize("cls",(Rental,CentsRental,CompactRental))
+@pytest.mark.parametrize("source_type",sections)
+def test_matches_baseline_renderer(cls,source_type):
+    rental = _fill(cls())
+    expected = _output(baseline_show,rental,source_type)
+    assert _output(rental.show_sources,source_type) == expected
+    # A page as long as the list is the whole table
+    assert _output(rental.show_sources,source_type,5,0) == expected
+
+def test_empty_and_paged():
+    rental = Rental()
+    assert _output(rental.show_expenses) == "There are currently no expenses\n"
+    paged = _output(_fill(rental).show_investments,2,1)
+    assert "investment 1" in paged and "investment 3" not in paged
+    assert "... 3 more not shown" in paged
@@ -0,0 +1,27 @@
+import numpy as np
+
+from rental_property_program import Rental
+from rental_simulation import Normal, PercentOf, RentalSimulation
+
+def make_rental():
+    rental = Rental()
+    rental.add_income_source("rent",2000)
+    rental.add_expense("tax",300)
+    rental.add_investment("down payment",50000)
+    return rental
+
+def test_percent_of_investment():
+    simulation = RentalSimulation(make_rental())
+    simulation.set_distribution("income","rent",Normal(2000,100))
+    simulation.set_distribution("investment","reserve",PercentOf("rent",10))
+    result = simulation.run(1000,seed=1)
+    # The reserve is 10 months of rent, so investment goes up and down with the rent drawn
+    rent = (result.yearly_cashflow / 12) + 300
+    expected = (rent - 300) * 12 * 100 / (50000 + 10 * rent)
+    assert np.allclose(result.roi,expected)
+
+def test_percent_of_investment_with_workers():
+    simulation = RentalSimulation(make_rental())
+    simulation.set_distribution("investment","reserve",PercentOf("rent",.1))
+    result = simulation.run(10,seed=1,chunk_size=5,workers=2)
+    assert np.allclose(result.roi,1700 * 12 * 100 / 50200)
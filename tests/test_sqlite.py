@@ -0,0 +1,23 @@
+from rental_property_program import Rental
+from rental_sqlite import RentalStore
+
+def _rental():
+    rental = Rental()
+    rental.set_source("income","Rent",1500)
+    rental.set_source("expense","Tax",200)
+    rental.set_source("investment","Down Payment",50000)
+    return rental
+
+def test_round_trip():
+    with RentalStore() as store:
+        store.save_rentals({"a":_rental(),"b":_rental()})
+        store.remove_line_item("b","expense","tax")
+        rental = store.get_rental("a")
+        assert rental.income_dict == {"rent":1500}
+        assert rental.get_monthly_cashflow() == 1300
+        assert rental.get_total_investment() == 50000
+        loaded = dict(store.rentals())
+        assert loaded["a"].expense_dict == {"tax":200}
+        assert loaded["b"].expense_dict == {}
+        assert loaded["b"].get_monthly_expenses() == 0
+        assert loaded["b"].get_yearly_roi() == 1500 * 1200 / 50000
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from rental_property_program import Rental
+from rental_store import MappedPortfolio, save_portfolio
+
+def _rentals():
+    rentals = dict()
+    for i in range(3):
+        rental = Rental()
+        rental.set_source("income","rent",1000 + i)
+        rental.set_source("expense","tax",100)
+        rental.set_source("investment","down payment",10000)
+        rentals[f"P{i}"] = rental
+    return rentals
+
+def test_close_while_holding_a_result(tmp_path):
+    file_name = str(tmp_path / "portfolio.bin")
+    save_portfolio(_rentals(),file_name)
+    with MappedPortfolio(file_name) as portfolio:
+        income = portfolio.get_monthly_income()
+        roi = portfolio.get_yearly_roi()
+        assert portfolio.get_rental("P2").get_monthly_income() == 1002
+    assert portfolio.totals is None
+    # Views taken before closing stay readable
+    assert income.tolist() == [1000,1001,1002]
+    assert np.allclose(roi,[(1000 + i - 100) * 1200 / 10000 for i in range(3)])
+    portfolio.close()
+
+def test_not_a_portfolio(tmp_path):
+    file_name = tmp_path / "other.bin"
+    file_name.write_bytes(b"X" * 64)
+    with pytest.raises(ValueError,match="not a rental portfolio file"):
+        MappedPortfolio(str(file_name))
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from rental_property_program import Rental
+
+def _rental():
+    rental = Rental()
+    rental.set_source("income","rent",2000)
+    rental.set_source("expense","tax",200)
+    rental.set_source("investment","down payment",40000)
+    return rental
+
+def test_grid_matches_changing_the_rental():
+    rental = _rental()
+    rents,taxes = [1500,2000,2500],[0,300]
+    grid = rental.sweep(("income","Rent",rents),("expense","tax",taxes))
+    assert grid["roi"].shape == (3,2)
+    for i,rent in enumerate(rents):
+        for j,tax in enumerate(taxes):
+            changed = _rental()
+            changed.update_income_source("rent",rent)
+            changed.update_expense("tax",tax)
+            assert grid["monthly_cashflow"][i,j] == pytest.approx(changed.get_monthly_cashflow())
+            assert grid["roi"][i,j] == pytest.approx(changed.get_yearly_roi())
+    # The Rental itself is left as it was
+    assert rental.get_monthly_income() == 2000
+
+def test_new_source_and_same_item_twice():
+    rental = _rental()
+    grid = rental.sweep(("expense","vacancy",np.array([0,100])))
+    assert grid["yearly_cashflow"].tolist() == [21600,20400]
+    with pytest.raises(ValueError):
+        rental.sweep(("income","rent",[1]),("income","Rent",[2]))